@@ -1,5 +1,9 @@
+import pandas as pd
 import streamlit as st
 
+from latincy_dashboard.docs import get_doc_cache
+from latincy_dashboard.models import get_registry
+
 st.set_page_config(
     page_title="LatinCy Dashboard | Home",
     page_icon="🏠",
@@ -24,3 +28,36 @@ st.markdown(
     - [Normalize U/V spelling](uv_normalizer_demo) with rule-based [latincy-uv](https://github.com/diyclassics/latincy-uv)
 """
 )
+
+with st.expander("Loaded models"):
+    registry = get_registry()
+    summary = registry.summary()
+    st.caption(
+        f"{summary['resident_models']} resident pipeline(s), "
+        f"~{summary['resident_bytes'] / 1024 ** 2:,.0f} MB; "
+        f"{summary['loads']} load(s), {summary['evictions']} eviction(s)"
+    )
+    model_stats = registry.stats()
+    if model_stats:
+        st.dataframe(pd.DataFrame(model_stats), hide_index=True)
+    else:
+        st.caption("No models loaded yet in this process.")
+
+with st.expander("Analysis cache"):
+    cache_stats = get_doc_cache().stats()
+    st.caption(
+        f"{cache_stats['entries']} cached Doc(s), "
+        f"{cache_stats['bytes'] / 1024 ** 2:,.1f} of "
+        f"{cache_stats['max_bytes'] / 1024 ** 2:,.0f} MB; "
+        f"{cache_stats['hits']} hit(s), {cache_stats['misses']} miss(es), "
+        f"{cache_stats['evictions']} eviction(s)"
+    )
+    doc_store = get_doc_cache().store
+    if doc_store is not None:
+        store_stats = doc_store.stats()
+        st.caption(
+            f"On-disk store `{store_stats['path']}`: {store_stats['entries']} Doc(s), "
+            f"{store_stats['bytes'] / 1024 ** 2:,.1f} of "
+            f"{store_stats['max_bytes'] / 1024 ** 2:,.0f} MB; "
+            f"{store_stats['hits']} hit(s), {store_stats['misses']} miss(es)"
+        )
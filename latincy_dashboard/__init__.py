@@ -0,0 +1 @@
+"""Shared helpers for the LatinCy Dashboard pages."""
@@ -0,0 +1,161 @@
+"""Approximate nearest-neighbour index for large floret vocabularies.
+
+Floret vectors have no ``most_similar``, so ``scripts/build_vector_index.py``
+computes vectors for a large word list offline and writes an IVF
+(inverted-file) index: unit-length vectors sorted by k-means cluster in a
+``.npy`` file that is memory-mapped at query time, plus the cluster
+centroids and offsets. A query scores the centroids, then only the rows of
+the ``n_probe`` closest clusters, so workers share the vectors through the
+OS page cache instead of each holding the matrix on its heap.
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from latincy_dashboard.vectors import normalize_rows, top_k
+
+VECTORS_FILE = "vectors.npy"
+CENTROIDS_FILE = "centroids.npy"
+OFFSETS_FILE = "offsets.npy"
+WORDS_FILE = "words.txt"
+META_FILE = "meta.json"
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray, chunk_size: int = 8192) -> np.ndarray:
+    """Return the closest centroid for every row, in chunks to bound memory."""
+    labels = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), chunk_size):
+        chunk = vectors[start : start + chunk_size]
+        labels[start : start + chunk_size] = np.argmax(chunk @ centroids.T, axis=1)
+    return labels
+
+
+def spherical_kmeans(
+    vectors: np.ndarray, n_lists: int, n_iter: int = 10, seed: int = 0
+) -> np.ndarray:
+    """Cluster unit-length ``vectors`` by cosine similarity and return the centroids."""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)].copy()
+    for _ in range(n_iter):
+        labels = _assign(vectors, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, vectors)
+        empty = ~sums.any(axis=1)
+        # Reseed empty clusters from random rows so every list stays in use
+        sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()), replace=False)]
+        centroids = normalize_rows(sums)
+    return centroids
+
+
+def build_ivf_index(
+    path: Path,
+    words: Sequence[str],
+    vectors: np.ndarray,
+    n_lists: Optional[int] = None,
+    meta: Optional[Dict[str, Any]] = None,
+    n_iter: int = 10,
+    seed: int = 0,
+):
+    """Cluster ``vectors`` and write the IVF index files to ``path``."""
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    vectors = normalize_rows(vectors)
+    if n_lists is None:
+        n_lists = max(int(np.sqrt(len(vectors))), 1)
+    n_lists = min(n_lists, len(vectors))
+    centroids = spherical_kmeans(vectors, n_lists, n_iter=n_iter, seed=seed)
+    labels = _assign(vectors, centroids)
+    # Store rows grouped by cluster so each list is one contiguous slice
+    order = np.argsort(labels, kind="stable")
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(labels, minlength=n_lists))])
+    np.save(path / VECTORS_FILE, vectors[order])
+    np.save(path / CENTROIDS_FILE, centroids)
+    np.save(path / OFFSETS_FILE, offsets)
+    with open(path / WORDS_FILE, "w", encoding="utf-8") as f:
+        f.writelines(f"{words[i]}\n" for i in order)
+    with open(path / META_FILE, "w", encoding="utf-8") as f:
+        json.dump({**(meta or {}), "n_words": len(words), "n_lists": n_lists}, f, indent=2)
+
+
+class IVFIndex:
+    """Read-only IVF index over memory-mapped unit-length vectors."""
+
+    def __init__(self, path: Path):
+        path = Path(path)
+        self.vectors = np.load(path / VECTORS_FILE, mmap_mode="r")
+        self.centroids = np.load(path / CENTROIDS_FILE)
+        self.offsets = np.load(path / OFFSETS_FILE)
+        with open(path / WORDS_FILE, encoding="utf-8") as f:
+            self.words = [line.rstrip("\n") for line in f]
+        with open(path / META_FILE, encoding="utf-8") as f:
+            self.meta = json.load(f)
+
+    def __len__(self):
+        return len(self.words)
+
+    def search(
+        self, queries: np.ndarray, k: int, n_probe: int = 8
+    ) -> List[List[Tuple[int, float]]]:
+        """Return approximate top-``k`` (row, score) pairs for each query."""
+        queries = normalize_rows(np.atleast_2d(queries))
+        probes = top_k(queries @ self.centroids.T, n_probe)
+        results = []
+        for query, lists in zip(queries, probes):
+            rows = np.concatenate(
+                [np.arange(self.offsets[i], self.offsets[i + 1]) for i in lists]
+            )
+            # Sorting the rows keeps reads from the memory map sequential
+            rows.sort()
+            scores = self.vectors[rows] @ query
+            best = top_k(scores, k)
+            results.append([(int(rows[i]), float(scores[i])) for i in best])
+        return results
+
+    def exact_search(self, queries: np.ndarray, k: int) -> List[List[Tuple[int, float]]]:
+        """Return exact top-``k`` (row, score) pairs by scoring every row."""
+        queries = normalize_rows(np.atleast_2d(queries))
+        scores = queries @ np.asarray(self.vectors).T
+        return [
+            [(int(i), float(row[i])) for i in best]
+            for row, best in zip(scores, top_k(scores, k))
+        ]
+
+    def most_similar(
+        self, words: Sequence[str], queries: np.ndarray, n_results: int, n_probe: int = 8
+    ) -> List[List[Tuple[str, float]]]:
+        """Return the nearest indexed words for each query, skipping the query word."""
+        results = []
+        for word, hits in zip(words, self.search(queries, n_results + 1, n_probe)):
+            named = [(self.words[i], score) for i, score in hits if self.words[i] != word]
+            results.append(named[:n_results])
+        return results
+
+
+def recall_report(
+    index: IVFIndex, queries: np.ndarray, k: int = 10, n_probes: Iterable[int] = (1, 2, 4, 8, 16, 32)
+) -> List[Dict[str, Any]]:
+    """Measure recall@k and latency of approximate search against exact search."""
+    start = time.perf_counter()
+    exact = index.exact_search(queries, k)
+    exact_ms = (time.perf_counter() - start) * 1000 / len(queries)
+    truth = [{i for i, _ in hits} for hits in exact]
+    report = [{"n_probe": "exact", "recall": 1.0, "ms_per_query": exact_ms}]
+    for n_probe in n_probes:
+        if n_probe > len(index.centroids):
+            break
+        start = time.perf_counter()
+        approx = index.search(queries, k, n_probe)
+        elapsed_ms = (time.perf_counter() - start) * 1000 / len(queries)
+        found = [len(t & {i for i, _ in hits}) for t, hits in zip(truth, approx)]
+        report.append(
+            {
+                "n_probe": n_probe,
+                "recall": sum(found) / sum(len(t) for t in truth),
+                "ms_per_query": elapsed_ms,
+            }
+        )
+    return report
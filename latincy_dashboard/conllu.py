@@ -0,0 +1,148 @@
+"""CoNLL-U formatting of analysed Docs."""
+
+import csv
+import io
+from itertools import takewhile
+from typing import Callable, Dict, Iterator, Optional
+
+import numpy as np
+from spacy.attrs import DEP, ENT_TYPE, HEAD, LEMMA, MORPH, ORTH, POS, TAG
+from spacy.tokens import Doc, Span, Token
+
+COLUMNS = [
+    "sent_id",
+    "token_id",
+    "form",
+    "lemma",
+    "upos",
+    "xpos",
+    "feats",
+    "head",
+    "deprel",
+    "ent_type",
+]
+
+ROW_ATTRS = [ORTH, LEMMA, POS, TAG, MORPH, HEAD, DEP, ENT_TYPE]
+
+
+def format_morph(morph):
+    morph = morph.to_dict()
+    if morph:
+        return ", ".join([f"{k}={v}" for k, v in morph.items()])
+    else:
+        return ""
+
+
+def _resolve(values: np.ndarray, lookup: Callable[[int], str]) -> np.ndarray:
+    """Map each value to a string, calling ``lookup`` once per unique value."""
+    _, first, inverse = np.unique(values, return_index=True, return_inverse=True)
+    labels = np.array([lookup(i) for i in first], dtype=object)
+    return labels[inverse]
+
+
+def doc_to_columns(doc: Doc, max_tokens: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """Return the tabular analysis of ``doc`` as one array per column in ``COLUMNS``.
+
+    All attributes are read with a single ``Doc.to_array`` call, heads are made
+    sentence-relative with array arithmetic, and strings are resolved once per
+    unique hash rather than once per token.
+    """
+    n = len(doc) if max_tokens is None else min(len(doc), max_tokens)
+    arr = doc.to_array(ROW_ATTRS)[:n]
+    strings = doc.vocab.strings
+
+    idx = np.arange(n, dtype=np.int64)
+    starts = np.fromiter(
+        takewhile(lambda start: start < n, (sent.start for sent in doc.sents)),
+        dtype=np.int64,
+    )
+    sent_of = np.searchsorted(starts, idx, side="right") - 1
+    sent_start = starts[sent_of]
+    # HEAD is stored as an unsigned offset from the token; reinterpret as signed
+    rel_head = arr[:, 5].view(np.int64)
+    head = np.where(rel_head == 0, 0, idx + rel_head - sent_start + 1)
+    sent_ids = np.array([f"s{i + 1}" for i in range(len(starts))], dtype=object)
+
+    def by_hash(col):
+        return _resolve(arr[:, col], lambda i: strings[int(arr[i, col])])
+
+    return {
+        "sent_id": sent_ids[sent_of],
+        "token_id": idx - sent_start + 1,
+        "form": by_hash(0),
+        "lemma": by_hash(1),
+        "upos": by_hash(2),
+        "xpos": by_hash(3),
+        "feats": _resolve(arr[:, 4], lambda i: format_morph(doc[int(i)].morph)),
+        "head": head,
+        "deprel": by_hash(6),
+        "ent_type": by_hash(7),
+    }
+
+
+def _field(value: str) -> str:
+    return value if value else "_"
+
+
+def _misc(token: Token) -> str:
+    misc = []
+    if token.ent_type_:
+        misc.append(f"NER={token.ent_iob_}-{token.ent_type_}")
+    if not token.whitespace_:
+        misc.append("SpaceAfter=No")
+    return "|".join(misc) if misc else "_"
+
+
+def iter_sent_conllu(sent: Span, sent_id: str) -> Iterator[str]:
+    """Yield the CoNLL-U lines for one sentence, ending with a blank line."""
+    # Whitespace tokens have no place in CoNLL-U, so number around them
+    tokens = [token for token in sent if not token.is_space]
+    ids = {token.i: idx for idx, token in enumerate(tokens, 1)}
+    yield f"# sent_id = {sent_id}"
+    yield f"# text = {' '.join(sent.text.split())}"
+    for token in tokens:
+        if token.head == token:
+            head, deprel = 0, "root"
+        else:
+            head, deprel = ids.get(token.head.i, 0), token.dep_
+        yield "\t".join(
+            (
+                str(ids[token.i]),
+                token.text,
+                _field(token.lemma_),
+                _field(token.pos_),
+                _field(token.tag_),
+                _field(str(token.morph)),
+                str(head),
+                _field(deprel),
+                "_",
+                _misc(token),
+            )
+        )
+    yield ""
+
+
+def iter_conllu(doc: Doc, sent_prefix: str = "") -> Iterator[str]:
+    """Yield the CoNLL-U lines for every sentence in ``doc``, one sentence at a time."""
+    sents = (sent for sent in doc.sents if sent.text.strip())
+    for sent_idx, sent in enumerate(sents, 1):
+        yield from iter_sent_conllu(sent, f"{sent_prefix}s{sent_idx}")
+
+
+def iter_tsv(doc: Doc, sent_prefix: str = "", header: bool = True) -> Iterator[str]:
+    """Yield the tab-separated ``COLUMNS`` table for ``doc``, one row at a time."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter="\t", lineterminator="")
+
+    def format_row(row) -> str:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(row)
+        return buffer.getvalue()
+
+    if header:
+        yield format_row(COLUMNS)
+    columns = doc_to_columns(doc)
+    columns["sent_id"] = sent_prefix + columns["sent_id"]
+    for row in zip(*(columns[col] for col in COLUMNS)):
+        yield format_row(row)
@@ -0,0 +1,118 @@
+"""Reading uploaded corpora for the batch modes."""
+
+import io
+import multiprocessing
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Iterable, Iterator, List, Tuple
+
+import spacy
+from spacy.language import Language
+from spacy.tokens import Doc, DocBin
+
+PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+
+
+def _decode(data: bytes) -> str:
+    return data.decode("utf-8-sig", errors="replace")
+
+
+def read_uploads(uploaded_files: Iterable) -> List[Tuple[str, str]]:
+    """Return (name, text) for every uploaded ``.txt`` file, expanding ``.zip`` archives."""
+    texts = []
+    for uploaded in uploaded_files:
+        data = uploaded.getvalue()
+        if uploaded.name.lower().endswith(".zip"):
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                for name in sorted(archive.namelist()):
+                    if name.startswith("__MACOSX/") or not name.lower().endswith(".txt"):
+                        continue
+                    texts.append((name, _decode(archive.read(name))))
+        else:
+            texts.append((uploaded.name, _decode(data)))
+    return texts
+
+
+def split_paragraphs(text: str) -> List[str]:
+    """Split ``text`` on blank lines, dropping empty paragraphs."""
+    return [para.strip() for para in PARAGRAPH_BREAK.split(text) if para.strip()]
+
+
+def chunk_paragraphs(text: str, max_chars: int) -> List[str]:
+    """Split ``text`` at paragraph breaks into chunks of about ``max_chars``.
+
+    Chunks keep their separators, so ``"".join(chunks) == text``; a single
+    paragraph longer than ``max_chars`` becomes a chunk of its own.
+    """
+    chunks = []
+    start = prev = 0
+    for end in [match.end() for match in PARAGRAPH_BREAK.finditer(text)] + [len(text)]:
+        if end - start > max_chars and prev > start:
+            chunks.append(text[start:prev])
+            start = prev
+        prev = end
+    if start < len(text):
+        chunks.append(text[start:])
+    return chunks
+
+
+def iter_paragraphs(texts: Iterable[Tuple[str, str]]) -> Iterator[Tuple[str, Tuple[str, int]]]:
+    """Yield (paragraph, (file name, paragraph index)) pairs for ``nlp.pipe(as_tuples=True)``."""
+    for name, text in texts:
+        for par_idx, para in enumerate(split_paragraphs(text)):
+            yield para, (name, par_idx)
+
+
+# A (paragraph, (file name, paragraph index)) pair from iter_paragraphs
+Paragraph = Tuple[str, Tuple[str, int]]
+
+_nlp = None
+
+
+def _process_pipeline(model_name: str) -> Language:
+    """Return this process's pipeline, loading it on first use."""
+    global _nlp
+    if _nlp is None:
+        _nlp = spacy.load(model_name)
+    return _nlp
+
+
+def parse_chunk(model_name: str, texts: List[str], batch_size: int) -> bytes:
+    """Parse one chunk of paragraphs in a worker, returning the Docs as DocBin bytes."""
+    nlp = _process_pipeline(model_name)
+    return DocBin(docs=nlp.pipe(texts, batch_size=batch_size), store_user_data=True).to_bytes()
+
+
+def pipe_paragraphs(
+    nlp: Language,
+    model_name: str,
+    paragraphs: List[Paragraph],
+    batch_size: int = 64,
+    n_process: int = 1,
+) -> Iterator[Tuple[Doc, str, int]]:
+    """Yield (doc, file name, paragraph index) for ``paragraphs``, in input order.
+
+    With ``n_process`` > 1 the paragraphs are parsed in chunks of
+    ``batch_size`` by spawned worker processes that each load
+    ``model_name``; their Docs are read back into ``nlp``'s vocab.
+    """
+    if n_process <= 1 or len(paragraphs) <= batch_size:
+        docs = nlp.pipe(paragraphs, as_tuples=True, batch_size=batch_size)
+        for doc, (name, par_idx) in docs:
+            yield doc, name, par_idx
+        return
+    chunks = [paragraphs[i : i + batch_size] for i in range(0, len(paragraphs), batch_size)]
+    # Spawn rather than fork (nlp.pipe's n_process): forking the multithreaded
+    # Streamlit server can copy a lock held by another thread and hang the worker
+    executor = ProcessPoolExecutor(n_process, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        texts = [[text for text, _ in chunk] for chunk in chunks]
+        results = executor.map(parse_chunk, repeat(model_name), texts, repeat(batch_size))
+        for chunk, data in zip(chunks, results):
+            docs = DocBin().from_bytes(data).get_docs(nlp.vocab)
+            for doc, (_, (name, par_idx)) in zip(docs, chunk):
+                yield doc, name, par_idx
+    finally:
+        executor.shutdown(cancel_futures=True)
@@ -0,0 +1,114 @@
+"""DCC Core Latin Vocabulary resource and the ``dcc_core`` pipeline component.
+
+The lemma list ships as ``data/dcc_core.txt`` and is read and compiled to
+lemma hash IDs once per process. Importing this module registers the
+``dcc_core`` factory and the ``Token._.is_dcc_core`` extension, so pages get
+the augmented pipeline from the shared model registry via ``get_dcc_model``.
+Lemmas are matched in the list's lower-case u-only spelling, so texts are
+analysed as written.
+"""
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+from spacy.attrs import IS_PUNCT, IS_SPACE, LEMMA
+from spacy.language import Language
+from spacy.strings import get_string_id
+from spacy.tokens import Span, Token
+
+from latincy_dashboard.models import get_model
+
+DCC_CORE_PATH = Path(__file__).parent / "data" / "dcc_core.txt"
+
+
+@lru_cache(maxsize=None)
+def load_core_lemmas() -> Tuple[str, ...]:
+    """Return the DCC core lemmas (u-only spelling) in list order."""
+    with open(DCC_CORE_PATH, encoding="utf-8") as f:
+        return tuple(
+            line.strip() for line in f if line.strip() and not line.startswith("#")
+        )
+
+
+@lru_cache(maxsize=None)
+def core_lemma_ids() -> np.ndarray:
+    """Return the sorted lemma hash IDs of the DCC core list."""
+    # String hashes don't depend on the vocab, so every pipeline can share them
+    return np.array(
+        sorted({get_string_id(lemma) for lemma in load_core_lemmas()}), dtype=np.uint64
+    )
+
+
+def normalize_for_dcc(text):
+    # The DCC list uses classical u-spelling
+    return text.replace("v", "u").replace("V", "U").lower()
+
+
+if not Token.has_extension("is_dcc_core"):
+    # Register a new token extension to flag core vocabulary
+    Token.set_extension("is_dcc_core", default=False)
+
+
+@Language.factory("dcc_core")
+def create_dcc_core_merger(nlp, name):
+    return DCCCoreMerger(nlp.vocab)
+
+
+class DCCCoreMerger:
+    def __init__(self, vocab):
+        self.core_ids = core_lemma_ids()
+        # Lemma hash -> hash of its DCC spelling, shared across Docs
+        self._dcc_ids = {}
+
+    def dcc_lemmas(self, doc, lemmas):
+        """Map LEMMA hashes to the hashes of their DCC spellings, once per distinct lemma."""
+        types, inverse = np.unique(lemmas, return_inverse=True)
+        strings = doc.vocab.strings
+        mapped = []
+        for lemma in types.tolist():
+            if lemma not in self._dcc_ids:
+                self._dcc_ids[lemma] = strings.add(normalize_for_dcc(strings[lemma]))
+            mapped.append(self._dcc_ids[lemma])
+        return np.array(mapped, dtype=np.uint64)[inverse.reshape(-1)]
+
+    def __call__(self, doc):
+        # This method is invoked when the component is called on a Doc
+        # One vectorized membership test over the Doc's normalized LEMMA array
+        is_core = np.isin(self.dcc_lemmas(doc, doc.to_array(LEMMA)), self.core_ids)
+        spans = []
+        for i in np.flatnonzero(is_core).tolist():
+            spans.append(Span(doc, i, i + 1, "CORE"))
+            doc[i]._.is_dcc_core = True
+        doc.spans["dcc_core"] = spans
+        return doc
+
+    def coverage(self, doc, top_n=10):
+        """Count core vs. non-core words in ``doc`` with array operations."""
+        arr = doc.to_array([LEMMA, IS_PUNCT, IS_SPACE])
+        lemmas = self.dcc_lemmas(doc, arr[(arr[:, 1] == 0) & (arr[:, 2] == 0), 0])
+        is_core = np.isin(lemmas, self.core_ids)
+        types, inverse = np.unique(lemmas, return_inverse=True)
+        counts = np.bincount(inverse, minlength=len(types))
+        core_types = np.isin(types, self.core_ids)
+        # Most frequent non-core lemmas, highest count first
+        non_core = np.flatnonzero(~core_types)
+        top = non_core[np.argsort(-counts[non_core], kind="stable")[:top_n]]
+        n_words = len(lemmas)
+        n_core = int(is_core.sum())
+        return {
+            "words": n_words,
+            "core_words": n_core,
+            "coverage": n_core / n_words if n_words else 0.0,
+            "lemmas": len(types),
+            "core_lemmas": int(core_types.sum()),
+            "top_non_core": [
+                (doc.vocab.strings[int(types[i])], int(counts[i])) for i in top
+            ],
+        }
+
+
+def get_dcc_model(model_name: str) -> Language:
+    """Get the shared pipeline for ``model_name`` with ``dcc_core`` added."""
+    return get_model(model_name, add=("dcc_core",))
@@ -0,0 +1,173 @@
+"""Content-addressed cache of analysed Docs shared across pages.
+
+Docs are stored as serialized ``DocBin`` bytes keyed by
+(model name, model version, pipeline config, text hash), so the same text
+analysed by the same pipeline on any page is only run through the model once.
+The cache is LRU-ordered and bounded by ``LATINCY_DOC_CACHE_MB`` (default 64);
+misses fall through to the optional on-disk ``DocStore`` when one is configured.
+"""
+
+import hashlib
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import streamlit as st
+from spacy.language import Language
+from spacy.tokens import Doc, DocBin
+
+from latincy_dashboard.store import DocStore
+
+DocKey = Tuple[str, str, str, str]
+
+_fingerprints: "weakref.WeakKeyDictionary[Language, str]" = weakref.WeakKeyDictionary()
+
+
+def text_hash(text: str) -> str:
+    """Return a stable hash of ``text``."""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def pipeline_fingerprint(nlp: Language) -> str:
+    """Return a hash of the pipeline config, computed once per pipeline object."""
+    fingerprint = _fingerprints.get(nlp)
+    if fingerprint is None:
+        config = nlp.config.to_str() + "|" + ",".join(nlp.pipe_names)
+        fingerprint = hashlib.sha1(config.encode("utf-8")).hexdigest()
+        _fingerprints[nlp] = fingerprint
+    return fingerprint
+
+
+def doc_key(nlp: Language, text: str) -> DocKey:
+    """Build the cache key for ``text`` analysed by ``nlp``."""
+    return (
+        f"{nlp.lang}_{nlp.meta.get('name', '')}",
+        nlp.meta.get("version", ""),
+        pipeline_fingerprint(nlp),
+        text_hash(text),
+    )
+
+
+def doc_to_bytes(doc: Doc) -> bytes:
+    """Serialize a Doc, including custom attributes, as DocBin bytes."""
+    doc_bin = DocBin(store_user_data=True)
+    doc_bin.add(doc)
+    return doc_bin.to_bytes()
+
+
+def doc_from_bytes(nlp: Language, data: bytes) -> Doc:
+    """Restore a Doc serialized with ``doc_to_bytes``."""
+    return next(DocBin().from_bytes(data).get_docs(nlp.vocab))
+
+
+class DocCache:
+    """LRU cache of serialized Docs bounded by total bytes."""
+
+    def __init__(self, max_bytes: int, store: Optional[DocStore] = None):
+        self.max_bytes = max_bytes
+        self.store = store
+        self._entries: "OrderedDict[DocKey, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: DocKey) -> Optional[bytes]:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key: DocKey, data: bytes):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= len(old)
+            self._entries[key] = data
+            self.bytes += len(data)
+            while self.bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes -= len(evicted)
+                self.evictions += 1
+
+    def _load(self, key: DocKey) -> Optional[bytes]:
+        """Look ``key`` up in memory, then in the persistent store."""
+        data = self.get(key)
+        if data is None and self.store is not None:
+            model, version = key[0], key[1]
+            self.store.invalidate(model, version)
+            data = self.store.get("/".join(key))
+            if data is not None:
+                self.put(key, data)
+        return data
+
+    def _save(self, key: DocKey, data: bytes):
+        self.put(key, data)
+        if self.store is not None:
+            self.store.put("/".join(key), key[0], key[1], data)
+
+    def analyze(self, nlp: Language, text: str) -> Doc:
+        """Return the Doc for ``text``, running ``nlp`` only on a cache miss."""
+        key = doc_key(nlp, text)
+        data = self._load(key)
+        if data is not None:
+            return doc_from_bytes(nlp, data)
+        doc = nlp(text)
+        self._save(key, doc_to_bytes(doc))
+        return doc
+
+    def analyze_many(
+        self, nlp: Language, texts: Sequence[str], batch_size: int = 64
+    ) -> Tuple[List[bytes], int]:
+        """Return serialized Docs for ``texts`` and how many had to be analysed.
+
+        Cache misses are run through ``nlp.pipe`` together.
+        """
+        keys = [doc_key(nlp, text) for text in texts]
+        results = [self._load(key) for key in keys]
+        missing = [i for i, data in enumerate(results) if data is None]
+        docs = nlp.pipe([texts[i] for i in missing], batch_size=batch_size)
+        for i, doc in zip(missing, docs):
+            results[i] = doc_to_bytes(doc)
+            self._save(keys[i], results[i])
+        return results, len(missing)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+@st.cache_resource
+def get_doc_cache() -> DocCache:
+    """Get the Doc cache shared by every session in this process."""
+    max_mb = int(os.environ.get("LATINCY_DOC_CACHE_MB", "64"))
+    store = None
+    store_path = os.environ.get("LATINCY_DOC_STORE")
+    if store_path:
+        store = DocStore(
+            store_path,
+            max_bytes=int(os.environ.get("LATINCY_DOC_STORE_MB", "512")) * 1024 * 1024,
+            ttl_seconds=float(os.environ.get("LATINCY_DOC_STORE_TTL_HOURS", "168")) * 3600,
+        )
+    return DocCache(max_bytes=max_mb * 1024 * 1024, store=store)
+
+
+def analyze(nlp: Language, text: str) -> Doc:
+    """Analyse ``text`` with ``nlp`` through the shared Doc cache."""
+    return get_doc_cache().analyze(nlp, text)
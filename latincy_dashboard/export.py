@@ -0,0 +1,157 @@
+"""Writing analysis exports without holding them in memory more than once.
+
+Text formats (TSV, CoNLL-U) are written line by line; the columnar formats
+(Parquet, Arrow IPC) are written in row groups with dictionary-encoded
+label columns; DocBin keeps the full spaCy annotation. Every export goes
+to a spooled temporary file that rolls over to disk when it grows large.
+"""
+
+import zipfile
+from tempfile import SpooledTemporaryFile
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
+from spacy.tokens import Doc, DocBin
+
+from latincy_dashboard.conllu import COLUMNS, doc_to_columns, iter_conllu, iter_tsv
+
+# Exports larger than this roll over from memory to a temporary file on disk
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+# Rows buffered before a Parquet row group / Arrow record batch is written
+ROW_GROUP_SIZE = 64 * 1024
+
+# Low-cardinality label columns stored as categoricals (dictionary-encoded)
+CATEGORICAL_COLUMNS = ("upos", "xpos", "feats", "deprel", "ent_type")
+
+# Export format -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    "TSV": ("tsv", "text/csv"),
+    "CoNLL-U": ("conllu", "text/plain"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "Arrow": ("arrows", "application/vnd.apache.arrow.stream"),
+    "DocBin": ("spacy", "application/octet-stream"),
+}
+
+# Each exported item is (doc, document name, paragraph index within the document);
+# an empty name exports a single text without document/paragraph prefixes
+ExportItem = Tuple[Doc, str, int]
+
+
+def spool_lines(lines: Iterable[str], max_size: int = SPOOL_MAX_SIZE) -> SpooledTemporaryFile:
+    """Write ``lines`` to a spooled temporary file and rewind it for reading."""
+    spool = SpooledTemporaryFile(max_size=max_size, mode="w+b")
+    for line in lines:
+        spool.write(line.encode("utf-8"))
+        spool.write(b"\n")
+    spool.seek(0)
+    return spool
+
+
+def _sent_prefix(name: str, par_idx: int) -> str:
+    return f"{name}-p{par_idx + 1}-" if name else ""
+
+
+def iter_export_lines(items: Iterable[ExportItem], export_format: str) -> Iterator[str]:
+    """Yield TSV or CoNLL-U lines for a stream of paragraph Docs."""
+    for item_idx, (doc, name, par_idx) in enumerate(items):
+        sent_prefix = _sent_prefix(name, par_idx)
+        if export_format == "CoNLL-U":
+            if name:
+                if par_idx == 0:
+                    yield f"# newdoc id = {name}"
+                yield "# newpar"
+            yield from iter_conllu(doc, sent_prefix)
+        else:
+            yield from iter_tsv(doc, sent_prefix=sent_prefix, header=item_idx == 0)
+
+
+def columns_to_table(columns: Dict[str, np.ndarray]):
+    """Build an Arrow table from ``doc_to_columns`` output, dictionary-encoding labels."""
+    import pyarrow as pa
+
+    arrays = []
+    for col in COLUMNS:
+        values = columns[col]
+        if col in CATEGORICAL_COLUMNS:
+            arrays.append(pa.array(values, type=pa.string()).dictionary_encode())
+        elif values.dtype == object:
+            arrays.append(pa.array(values, type=pa.string()))
+        else:
+            arrays.append(pa.array(values, type=pa.int64()))
+    return pa.Table.from_arrays(arrays, names=COLUMNS)
+
+
+class ColumnarWriter:
+    """Write tables to a Parquet file or Arrow IPC stream in large row groups."""
+
+    def __init__(self, sink, export_format: str, row_group_size: int = ROW_GROUP_SIZE):
+        self.sink = sink
+        self.export_format = export_format
+        self.row_group_size = row_group_size
+        self._buffer: List = []
+        self._rows = 0
+        self._writer = None
+
+    def write(self, table):
+        self._buffer.append(table)
+        self._rows += table.num_rows
+        if self._rows >= self.row_group_size:
+            self._flush()
+
+    def _flush(self):
+        import pyarrow as pa
+
+        if not self._buffer:
+            return
+        # One shared dictionary per row group keeps the categoricals compact
+        table = pa.concat_tables(self._buffer).unify_dictionaries().combine_chunks()
+        self._buffer, self._rows = [], 0
+        if self._writer is None:
+            if self.export_format == "Parquet":
+                import pyarrow.parquet as pq
+
+                self._writer = pq.ParquetWriter(self.sink, table.schema)
+            else:
+                # The IPC stream format allows a new dictionary per batch
+                self._writer = pa.ipc.new_stream(self.sink, table.schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is None and not self._buffer:
+            empty = {col: np.array([], dtype=object) for col in COLUMNS}
+            empty["token_id"] = empty["head"] = np.array([], dtype=np.int64)
+            self._buffer.append(columns_to_table(empty))
+        self._flush()
+        self._writer.close()
+
+
+def write_export(items: Iterable[ExportItem], export_format: str) -> SpooledTemporaryFile:
+    """Write ``items`` in ``export_format`` to a rewound spooled temporary file."""
+    if export_format in ("TSV", "CoNLL-U"):
+        return spool_lines(iter_export_lines(items, export_format))
+    spool = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE, mode="w+b")
+    if export_format == "DocBin":
+        doc_bin = DocBin(store_user_data=True)
+        for doc, _, _ in items:
+            doc_bin.add(doc)
+        spool.write(doc_bin.to_bytes())
+    else:
+        writer = ColumnarWriter(spool, export_format)
+        for doc, name, par_idx in items:
+            columns = doc_to_columns(doc)
+            columns["sent_id"] = _sent_prefix(name, par_idx) + columns["sent_id"]
+            writer.write(columns_to_table(columns))
+        writer.close()
+    spool.seek(0)
+    return spool
+
+
+def write_text_archive(texts: Iterable[Tuple[str, str]]) -> SpooledTemporaryFile:
+    """Write (name, text) pairs to a zip archive in a rewound spooled temporary file."""
+    spool = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE, mode="w+b")
+    with zipfile.ZipFile(spool, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, text in texts:
+            archive.writestr(name, text)
+    spool.seek(0)
+    return spool
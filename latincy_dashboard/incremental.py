@@ -0,0 +1,189 @@
+"""Incremental re-analysis of a text edited between runs.
+
+The first version of a text is analysed in one pass, through the shared Doc
+cache. Each session keeps the last analysed Doc per pipeline, and when the
+user edits the text only the changed stretch is re-run: it is widened to
+the sentence boundaries the model produced last time (or to blank lines,
+for pipelines that don't segment sentences) plus one neighbouring sentence
+on each side, analysed as one Doc, and stitched between the unchanged
+sentences of the previous Doc with ``Doc.from_docs``.
+
+Only boundaries the model itself produced are used, so sentences are never
+split in a way a single pass wouldn't split them. Pages whose output is the
+sentence segmentation or the parse of whole sentences should still use
+``latincy_dashboard.docs.analyze``.
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Optional, Tuple
+
+import streamlit as st
+from spacy.language import Language
+from spacy.tokens import Doc, Span
+
+from latincy_dashboard.docs import (
+    DocCache,
+    doc_from_bytes,
+    doc_key,
+    doc_to_bytes,
+    get_doc_cache,
+)
+
+# Whitespace with an empty line in it, where pipelines without sentences may be cut
+BLANK_LINE = re.compile(r"\n\s*\n")
+
+
+def common_prefix(a: str, b: str) -> int:
+    """Return the length of the longest common prefix of ``a`` and ``b``."""
+    n = min(len(a), len(b))
+    i = 0
+    # Compare in blocks, then character by character inside the first differing one
+    block = 256
+    while i + block <= n and a[i : i + block] == b[i : i + block]:
+        i += block
+    while i < n and a[i] == b[i]:
+        i += 1
+    return i
+
+
+def common_suffix(a: str, b: str, limit: int) -> int:
+    """Return the length of the longest common suffix of ``a`` and ``b``, up to ``limit``."""
+    return common_prefix(a[::-1][:limit], b[::-1][:limit])
+
+
+def cut_points(doc: Doc) -> List[int]:
+    """Token indices ``doc`` can be cut at without changing how it is analysed.
+
+    These are the sentence starts the model produced or, if the pipeline
+    doesn't set sentences, the tokens after a blank line; in both cases only
+    where whitespace separates the tokens, so the tokenizer splits there too.
+    """
+    if doc.has_annotation("SENT_START"):
+        starts = [sent.start for sent in doc.sents][1:]
+    else:
+        starts = [
+            token.i + 1 for token in doc[:-1] if token.is_space and BLANK_LINE.search(token.text)
+        ]
+    return [
+        i for i in starts if doc[i - 1].whitespace_ or doc[i - 1].is_space or doc[i].is_space
+    ]
+
+
+def slice_doc(doc: Doc, start: int, end: int) -> Doc:
+    """Copy tokens ``start:end`` of ``doc`` with their extension values and span groups."""
+    piece = doc[start:end].as_doc(copy_user_data=True)
+    n_chars = len(piece.text)
+    # as_doc copies every token's extension values, shifted; keep this slice's own
+    piece.user_data = {
+        key: value
+        for key, value in piece.user_data.items()
+        if isinstance(key, tuple)
+        and len(key) == 4
+        and key[0] == "._."
+        and key[2] is not None
+        and 0 <= key[2] < n_chars
+    }
+    for name, group in doc.spans.items():
+        piece.spans[name] = [
+            Span(piece, span.start - start, span.end - start, span.label, kb_id=span.kb_id)
+            for span in group
+            if span.start >= start and span.end <= end
+        ]
+    return piece
+
+
+class IncrementalAnalyzer:
+    """Analyse successive versions of a text, re-running only the edited sentences."""
+
+    def __init__(self, cache: Optional[DocCache] = None, batch_size: int = 64):
+        self.cache = cache
+        self.batch_size = batch_size
+        # The previous version and its serialized Doc
+        self._text: Optional[str] = None
+        self._data: Optional[bytes] = None
+        self.last_run: Dict[str, Any] = {"segments": 0, "analysed": 0}
+
+    def _run(self, nlp: Language, text: str) -> Tuple[Doc, bool]:
+        """Analyse ``text`` in one pass, returning the Doc and whether ``nlp`` ran."""
+        if self.cache is None:
+            return nlp(text), True
+        (data,), n_analysed = self.cache.analyze_many(nlp, [text], self.batch_size)
+        return doc_from_bytes(nlp, data), n_analysed > 0
+
+    def _changed_span(self, old: Doc, text: str) -> Optional[Tuple[int, int]]:
+        """Return the tokens of ``old`` to re-run for ``text``, or None to re-run it all."""
+        if not len(old):
+            return None
+        old_text = old.text
+        prefix = common_prefix(old_text, text)
+        suffix = common_suffix(old_text, text, min(len(old_text), len(text)) - prefix)
+        cuts = [0] + cut_points(old) + [len(old)]
+        chars = [old[i].idx for i in cuts[:-1]] + [len(old_text)]
+        delta = len(text) - len(old_text)
+        # From the sentence before the one holding the first change...
+        lo = max(0, bisect_right(chars, prefix) - 2)
+        # ...to the sentence after the one holding the last change
+        hi = min(len(cuts) - 1, bisect_left(chars, len(old_text) - suffix) + 1)
+        # The unchanged tail must still be separated by whitespace in the new text
+        while hi < len(cuts) - 1:
+            at = chars[hi] + delta
+            if at == 0 or text[at - 1].isspace() or text[at].isspace():
+                break
+            hi += 1
+        if lo == 0 and hi == len(cuts) - 1:
+            return None
+        return cuts[lo], cuts[hi]
+
+    def analyze(self, nlp: Language, text: str) -> Doc:
+        doc = None
+        if self._text == text:
+            doc = doc_from_bytes(nlp, self._data)
+            self.last_run = {"segments": len(cut_points(doc)) + 1, "analysed": 0}
+        elif self._text is not None and text:
+            doc = self._reanalyze(nlp, doc_from_bytes(nlp, self._data), text)
+        if doc is None:
+            doc, ran = self._run(nlp, text)
+            n_segments = len(cut_points(doc)) + 1
+            self.last_run = {"segments": n_segments, "analysed": n_segments if ran else 0}
+        self._text, self._data = text, doc_to_bytes(doc)
+        return doc
+
+    def _reanalyze(self, nlp: Language, old: Doc, text: str) -> Optional[Doc]:
+        """Re-run the edited sentences of ``old`` and stitch them into its unchanged ones."""
+        span = self._changed_span(old, text)
+        if span is None:
+            return None
+        start, end = span
+        delta = len(text) - len(old.text)
+        span_start = old[start].idx
+        span_end = (old[end].idx if end < len(old) else len(old.text)) + delta
+        edited, ran = self._run(nlp, text[span_start:span_end])
+        pieces = []
+        if start > 0:
+            pieces.append(slice_doc(old, 0, start))
+        if len(edited):
+            pieces.append(edited)
+        if end < len(old):
+            pieces.append(slice_doc(old, end, len(old)))
+        doc = Doc.from_docs(pieces, ensure_whitespace=False)
+        if not old.has_annotation("SENT_START"):
+            # from_docs starts a sentence at every piece; the pipeline set none
+            for token in doc[1:]:
+                token.is_sent_start = None
+        self.last_run = {
+            "segments": len(cut_points(doc)) + 1,
+            "analysed": len(cut_points(edited)) + 1 if ran and len(edited) else 0,
+        }
+        return doc
+
+
+def get_session_analyzer(nlp: Language) -> IncrementalAnalyzer:
+    """Get this session's incremental analyzer for ``nlp``'s pipeline."""
+    analyzers = st.session_state.setdefault("incremental_analyzers", {})
+    # Model name, version and pipeline config; the text hash is irrelevant here
+    key = doc_key(nlp, "")[:3]
+    if key not in analyzers:
+        analyzers[key] = IncrementalAnalyzer(get_doc_cache())
+    return analyzers[key]
+
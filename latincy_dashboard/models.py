@@ -0,0 +1,233 @@
+"""Process-wide registry of loaded LatinCy pipelines.
+
+Every page asks the registry for its pipeline instead of calling
+``spacy.load`` itself, so each (model, excluded, added) combination is
+loaded once per process and shared by all sessions.
+
+Resident pipelines are kept in least-recently-used order. Set
+``LATINCY_MAX_MODELS`` (a count) and/or ``LATINCY_MAX_MODEL_MB`` (resident
+megabytes) to cap them; pipelines over budget are evicted and reloaded
+transparently the next time they are requested.
+"""
+
+import os
+import resource
+import sys
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import spacy
+import streamlit as st
+from spacy.language import Language
+from spacy.util import get_package_path, is_package, load_config
+
+ModelKey = Tuple[str, Tuple[str, ...], Tuple[str, ...]]
+
+
+def _rss_bytes() -> int:
+    """Return the current resident set size of this process in bytes."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # Peak RSS is the best we can do off Linux; macOS reports it in bytes
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def make_key(
+    model_name: str, exclude: Iterable[str] = (), add: Iterable[str] = ()
+) -> ModelKey:
+    """Build the registry key for a pipeline variant."""
+    # Excluded components are a set; added components keep their order
+    return (model_name, tuple(sorted(exclude)), tuple(add))
+
+
+def _env_int(name: str) -> Optional[int]:
+    value = os.environ.get(name, "").strip()
+    return int(value) if value else None
+
+
+class ModelRegistry:
+    """Load each pipeline variant once and evict the least recently used over budget."""
+
+    def __init__(self, max_models: Optional[int] = None, max_mb: Optional[int] = None):
+        self.max_models = max_models
+        self.max_bytes = max_mb * 1024 * 1024 if max_mb else None
+        self._models: "OrderedDict[ModelKey, Language]" = OrderedDict()
+        self._info: Dict[ModelKey, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+        # One lock per pipeline being loaded, so a slow load only blocks its own key
+        self._loading: Dict[ModelKey, threading.Lock] = {}
+        self.loads = 0
+        self.evictions = 0
+
+    def get(
+        self,
+        model_name: str,
+        exclude: Iterable[str] = (),
+        add: Iterable[str] = (),
+    ) -> Language:
+        """Return the pipeline for ``model_name``, loading it on first use.
+
+        Resident pipelines are looked up under the registry lock, but
+        ``spacy.load`` runs outside it: other sessions keep getting their
+        pipelines while one loads, and concurrent requests for the same
+        pipeline wait for a single load.
+        """
+        key = make_key(model_name, exclude, add)
+        while True:
+            with self._lock:
+                nlp = self._lookup(key)
+                if nlp is not None:
+                    return nlp
+                load_lock = self._loading.setdefault(key, threading.Lock())
+            with load_lock:
+                with self._lock:
+                    # Another session may have loaded it while we waited
+                    nlp = self._lookup(key)
+                    if nlp is not None:
+                        return nlp
+                    if self._loading.get(key) is not load_lock:
+                        # A failed load released this lock; queue on the current one
+                        continue
+                try:
+                    nlp, info = self._load(key)
+                except BaseException:
+                    with self._lock:
+                        self._loading.pop(key, None)
+                    raise
+                with self._lock:
+                    self._insert(key, nlp, info)
+                    self._evict(keep=key)
+                    self._info[key]["hits"] += 1
+                    self._loading.pop(key, None)
+                return nlp
+
+    def _lookup(self, key: ModelKey) -> Optional[Language]:
+        """Return a resident pipeline, marking it most recently used."""
+        nlp = self._models.get(key)
+        if nlp is not None:
+            self._models.move_to_end(key)
+            self._info[key]["hits"] += 1
+        return nlp
+
+    def _load(self, key: ModelKey) -> Tuple[Language, Dict[str, Any]]:
+        model_name, exclude, add = key
+        # Loads of other pipelines can overlap, so the RSS delta is an estimate
+        rss_before = _rss_bytes()
+        start = time.perf_counter()
+        nlp = spacy.load(model_name, exclude=list(exclude))
+        for component in add:
+            nlp.add_pipe(component, last=True)
+        info = {
+            "model": model_name,
+            "version": nlp.meta.get("version", ""),
+            "exclude": ", ".join(exclude),
+            "add": ", ".join(add),
+            "load_seconds": time.perf_counter() - start,
+            "resident_bytes": _rss_bytes() - rss_before,
+        }
+        return nlp, info
+
+    def _insert(self, key: ModelKey, nlp: Language, info: Dict[str, Any]):
+        self.loads += 1
+        self._models[key] = nlp
+        # Hit and reload counts survive eviction so reloads stay visible
+        previous = self._info.get(key, {})
+        self._info[key] = {
+            **info,
+            # A reload can reuse freed pages, so keep the largest measurement
+            "resident_bytes": max(
+                info["resident_bytes"], previous.get("resident_bytes", 0)
+            ),
+            "resident": True,
+            "loads": previous.get("loads", 0) + 1,
+            "hits": previous.get("hits", 0),
+        }
+
+    def _over_budget(self) -> bool:
+        if self.max_models is not None and len(self._models) > self.max_models:
+            return True
+        if self.max_bytes is not None and self.resident_bytes > self.max_bytes:
+            return True
+        return False
+
+    def _evict(self, keep: ModelKey):
+        """Drop least recently used pipelines until back under budget."""
+        while self._over_budget():
+            oldest = next(iter(self._models))
+            if oldest == keep:
+                # Never evict the pipeline that was just requested
+                break
+            del self._models[oldest]
+            self._info[oldest]["resident"] = False
+            self.evictions += 1
+
+    @property
+    def resident_bytes(self) -> int:
+        """Estimated memory held by the resident pipelines."""
+        return sum(self._info[key]["resident_bytes"] for key in self._models)
+
+    def summary(self) -> Dict[str, Any]:
+        """Return registry-wide counters for sizing containers."""
+        with self._lock:
+            return {
+                "resident_models": len(self._models),
+                "resident_bytes": self.resident_bytes,
+                "loads": self.loads,
+                "evictions": self.evictions,
+                "max_models": self.max_models,
+                "max_bytes": self.max_bytes,
+            }
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Return load time, resident size and usage for each pipeline seen so far."""
+        with self._lock:
+            return [dict(info) for info in self._info.values()]
+
+    def clear(self, key: Optional[ModelKey] = None):
+        """Drop one pipeline (or all of them) from the registry."""
+        with self._lock:
+            keys = [key] if key is not None else list(self._info)
+            for k in keys:
+                self._models.pop(k, None)
+                self._info.pop(k, None)
+
+
+@st.cache_resource
+def get_registry() -> ModelRegistry:
+    """Get the registry shared by every session in this process."""
+    return ModelRegistry(
+        max_models=_env_int("LATINCY_MAX_MODELS"),
+        max_mb=_env_int("LATINCY_MAX_MODEL_MB"),
+    )
+
+
+def get_model(
+    model_name: str, exclude: Iterable[str] = (), add: Iterable[str] = ()
+) -> Language:
+    """Get a shared pipeline from the process-wide registry."""
+    return get_registry().get(model_name, exclude=exclude, add=add)
+
+
+@lru_cache(maxsize=None)
+def model_pipe_names(model_name: str) -> Tuple[str, ...]:
+    """Read a model's component names from its config without loading it."""
+    path = get_package_path(model_name) if is_package(model_name) else Path(model_name)
+    config_path = path / "config.cfg"
+    if not config_path.exists():
+        # Installed packages keep their data in a versioned subdirectory
+        config_path = next(path.glob("*/config.cfg"), None)
+        if config_path is None:
+            raise OSError(f"No config.cfg found for model {model_name!r} in {path}")
+    return tuple(load_config(config_path)["nlp"]["pipeline"])
+
+
+def get_vectors_model(model_name: str) -> Language:
+    """Get a shared pipeline with every component excluded: just vocab and vectors."""
+    return get_model(model_name, exclude=model_pipe_names(model_name))
@@ -0,0 +1,112 @@
+"""Optional SQLite store for analysed Docs that survives restarts.
+
+Set ``LATINCY_DOC_STORE`` to a file path to enable it. The store sits
+behind the in-memory Doc cache, can be shared by worker processes on one
+host, and is bounded by ``LATINCY_DOC_STORE_MB`` (default 512) and
+``LATINCY_DOC_STORE_TTL_HOURS`` (default 168). Rows written by an older
+model version are dropped the first time the new version is seen.
+"""
+
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Set, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    version TEXT NOT NULL,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS docs_model ON docs (model, version);
+CREATE INDEX IF NOT EXISTS docs_accessed ON docs (accessed);
+"""
+
+
+class DocStore:
+    """Size- and TTL-bounded SQLite table of serialized Docs."""
+
+    def __init__(self, path: str, max_bytes: int, ttl_seconds: float):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._checked: Set[Tuple[str, str]] = set()
+        # Several workers may share the file, so wait on locks and use WAL
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self.hits = 0
+        self.misses = 0
+
+    def invalidate(self, model: str, version: str):
+        """Drop rows for ``model`` written by any version other than ``version``."""
+        if (model, version) in self._checked:
+            return
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM docs WHERE model = ? AND version != ?", (model, version)
+            )
+        self._checked.add((model, version))
+
+    def get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT data FROM docs WHERE key = ? AND created > ?",
+                (key, now - self.ttl_seconds),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE docs SET accessed = ? WHERE key = ?", (now, key))
+        self.hits += 1
+        return row[0]
+
+    def put(self, key: str, model: str, version: str, data: bytes):
+        if len(data) > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO docs VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, model, version, data, len(data), now, now),
+            )
+            self._prune(now)
+
+    def _prune(self, now: float):
+        """Delete expired rows, then least recently accessed rows over budget."""
+        self._conn.execute(
+            "DELETE FROM docs WHERE created <= ?", (now - self.ttl_seconds,)
+        )
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM docs").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        freed = 0
+        stale = []
+        rows = self._conn.execute("SELECT key, size FROM docs ORDER BY accessed").fetchall()
+        for key, size in rows:
+            stale.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self._conn.executemany("DELETE FROM docs WHERE key = ?", stale)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM docs"
+            ).fetchone()
+        return {
+            "path": self.path,
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
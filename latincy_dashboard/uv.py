@@ -0,0 +1,426 @@
+"""U/V normalization helpers for the latincy-uv page.
+
+Evaluation works on NumPy arrays of code points: the source, normalized and
+reference texts are compared position by position with boolean masks, so
+scoring a treebank-sized reference corpus takes array operations rather
+than a Python loop over every character. Diffs are rendered the same way,
+as one HTML span per run of identically coloured characters.
+
+Whole corpora are normalized in paragraph chunks across a process pool
+(``normalize_corpus``); each worker builds its own normalizer once.
+
+``CachedNormalizer`` memoises the rule cascade per word. A few hundred forms
+make up most of any Latin text, so normalizing large texts is mostly
+dictionary lookups; only tokens whose letters are joined to something
+other than edge punctuation (hyphens, apostrophes, digits) go through the
+rules in full.
+"""
+
+import html
+import multiprocessing
+import re
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from latincy_dashboard.corpus import chunk_paragraphs
+
+COUNT_KEYS = (
+    "total_uv",
+    "correct",
+    "true_positives",
+    "false_positives",
+    "false_negatives",
+    "changes_needed",
+    "changes_made",
+)
+
+
+def to_uonly(text: str) -> str:
+    """Convert text to u-only spelling (all v -> u)."""
+    return text.replace("v", "u").replace("V", "U")
+
+
+def codepoints(text: str) -> np.ndarray:
+    """Return the Unicode code points of ``text`` as a uint32 array."""
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+
+
+UV_CODEPOINTS = codepoints("uvUV")
+
+
+def count_metrics(source: str, normalized: str, reference: str) -> Dict[str, int]:
+    """Count correct, needed and made changes at every u/v position."""
+    n = min(len(source), len(normalized), len(reference))
+    src = codepoints(source[:n])
+    norm = codepoints(normalized[:n])
+    ref = codepoints(reference[:n])
+
+    is_uv = np.isin(src, UV_CODEPOINTS)
+    needed = is_uv & (src != ref)
+    made = is_uv & (src != norm)
+    match = is_uv & (norm == ref)
+    wrong = is_uv & ~match
+
+    return {
+        "total_uv": int(is_uv.sum()),
+        "correct": int(match.sum()),
+        "true_positives": int((match & needed & made).sum()),
+        "false_positives": int((wrong & made & ~needed).sum()),
+        "false_negatives": int((wrong & needed & ~made).sum()),
+        "changes_needed": int(needed.sum()),
+        "changes_made": int(made.sum()),
+    }
+
+
+def metrics_from_counts(counts: Dict[str, int]) -> Dict[str, Any]:
+    """Add accuracy, precision, recall and F1 to a set of counts."""
+    total_uv = counts["total_uv"]
+    changes_made = counts["changes_made"]
+    changes_needed = counts["changes_needed"]
+    true_positives = counts["true_positives"]
+
+    accuracy = counts["correct"] / total_uv if total_uv > 0 else 1.0
+    precision = true_positives / changes_made if changes_made > 0 else 1.0
+    recall = true_positives / changes_needed if changes_needed > 0 else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if (precision + recall) > 0 else 0.0
+
+    return {
+        **counts,
+        "accuracy": accuracy,
+        "precision": precision,
+        "recall": recall,
+        "f1": f1,
+    }
+
+
+def calculate_metrics(source: str, normalized: str, reference: str) -> Dict[str, Any]:
+    """Calculate accuracy metrics."""
+    return metrics_from_counts(count_metrics(source, normalized, reference))
+
+
+def sum_counts(all_counts: Iterable[Dict[str, int]]) -> Dict[str, int]:
+    """Add up per-file counts so corpus metrics are micro-averaged."""
+    total = Counter({key: 0 for key in COUNT_KEYS})
+    for counts in all_counts:
+        total.update({key: counts[key] for key in COUNT_KEYS})
+    return dict(total)
+
+
+# HTML styling
+HTML_GREEN = '<span style="color: #28a745; font-weight: bold">'
+HTML_RED = '<span style="color: #dc3545; font-weight: bold">'
+HTML_GREY = '<span style="color: #6c757d">'
+HTML_END = "</span>"
+
+# Changed runs are short tags nested in one grey span around the whole text
+RUN_GREEN = '<b style="color: #28a745">'
+RUN_RED = '<b style="color: #dc3545">'
+RUN_END = "</b>"
+
+# Texts longer than this are rendered a page at a time
+MAX_RENDER_CHARS = 20_000
+
+
+def change_classes(original: str, normalized: str, reference: Optional[str] = None) -> np.ndarray:
+    """Classify each position as unchanged (0), changed (1) or changed wrongly (2)."""
+    n = min(len(original), len(normalized))
+    norm = codepoints(normalized[:n])
+    classes = (codepoints(original[:n]) != norm).astype(np.int8)
+    if reference:
+        m = min(n, len(reference))
+        wrong = norm[:m] != codepoints(reference[:m])
+        classes[:m][wrong & (classes[:m] == 1)] = 2
+    return classes
+
+
+def colorize_changes(
+    original: str,
+    normalized: str,
+    reference: Optional[str] = None,
+    start: int = 0,
+    end: Optional[int] = None,
+) -> str:
+    """Create HTML with color-coded changes, one tag per run of changed characters.
+
+    Only characters ``start:end`` are rendered, so long texts can be shown a
+    page at a time.
+    """
+    classes = change_classes(original, normalized, reference)[start:end]
+    text = normalized[start : start + len(classes)]
+    # Each run starts where the class differs from the previous character's
+    starts = np.flatnonzero(np.diff(classes, prepend=-1)).tolist()
+    result = [HTML_GREY]
+    for a, b in zip(starts, starts[1:] + [len(classes)]):
+        run = html.escape(text[a:b], quote=False)
+        if classes[a] == 0:
+            result.append(run)
+        else:
+            result.append(f"{RUN_RED if classes[a] == 2 else RUN_GREEN}{run}{RUN_END}")
+    result.append(HTML_END)
+    return "".join(result)
+
+
+def page_bounds(text: str, page_chars: int = MAX_RENDER_CHARS) -> List[Tuple[int, int]]:
+    """Split ``text`` into (start, end) pages of at most ``page_chars``, breaking at whitespace."""
+    bounds = []
+    start = 0
+    while start < len(text):
+        end = min(start + page_chars, len(text))
+        if end < len(text):
+            space = max(text.rfind(" ", start, end), text.rfind("\n", start, end))
+            if space > start:
+                end = space + 1
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+
+def count_rules(changes: Iterable) -> Counter:
+    """Count the changes attributed to each rule."""
+    return Counter(change.rule for change in changes)
+
+
+# Words memoised by CachedNormalizer
+WORD_CACHE_SIZE = 100_000
+
+WHITESPACE = re.compile(r"(\s+)")
+HAS_UV = re.compile(r"[uvUV]")
+# One run of letters with optional punctuation on either side
+PLAIN_TOKEN = re.compile(r"([^\w\s]*)([^\W\d_]+)([^\w\s]*)")
+
+# Characters of surrounding text shown on each side of a change
+CONTEXT_CHARS = 10
+
+# A change as (offset in its word or token, original, normalized, rule)
+RelativeChange = Tuple[int, str, str, str]
+
+
+class UVChange(NamedTuple):
+    """One change in a ``NormalizedText``, positioned in the whole text."""
+
+    position: int
+    original: str
+    normalized: str
+    rule: str
+    context: str
+
+
+class NormalizedText(NamedTuple):
+    """Result of ``CachedNormalizer.normalize_detailed``.
+
+    Has the ``normalized`` and ``changes`` of a latincy-uv
+    ``NormalizationResult``. Changes are cached relative to their word and
+    placed back in the text each time, so ``position`` and ``context``
+    always refer to the text that was normalized.
+    """
+
+    original: str
+    normalized: str
+    changes: List[UVChange]
+
+
+def relative_changes(text: str, changes: Iterable) -> Tuple[RelativeChange, ...]:
+    """Reduce latincy-uv changes for ``text`` to (position, original, normalized, rule) tuples.
+
+    Raises ValueError if a change's ``original`` is not at its ``position`` in ``text``.
+    """
+    result = []
+    for change in changes:
+        position = change.position
+        if text[position : position + len(change.original)] != change.original:
+            raise ValueError(
+                f"latincy-uv change {change.original!r} -> {change.normalized!r} "
+                f"is not at position {position} of {text!r}"
+            )
+        result.append((position, change.original, change.normalized, change.rule))
+    return tuple(result)
+
+
+class CachedNormalizer:
+    """Wrap a latincy-uv normalizer with a least-recently-used per-word cache."""
+
+    def __init__(self, normalizer, max_size: int = WORD_CACHE_SIZE):
+        self.normalizer = normalizer
+        self.max_size = max_size
+        self._words: "OrderedDict[str, Tuple[str, Tuple[RelativeChange, ...]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+
+    def __len__(self):
+        return len(self._words)
+
+    def __getstate__(self):
+        # Locks can't be pickled; spaCy sends pipelines to nlp.pipe worker processes
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _word(self, word: str) -> Tuple[str, Tuple[RelativeChange, ...], bool]:
+        """Return the normalized word, its changes, and whether the rules had to run."""
+        with self._lock:
+            cached = self._words.get(word)
+            if cached is not None:
+                self._words.move_to_end(word)
+                return cached + (False,)
+        result = self.normalizer.normalize_detailed(word)
+        cached = (result.normalized, relative_changes(word, result.changes))
+        with self._lock:
+            self._words[word] = cached
+            while len(self._words) > self.max_size:
+                self._words.popitem(last=False)
+        return cached + (True,)
+
+    def _token(self, token: str) -> Tuple[str, Tuple[RelativeChange, ...], str, bool]:
+        """Normalize one whitespace-delimited token as (text, changes, kind, missed).
+
+        Change offsets are relative to the token.
+        """
+        if not HAS_UV.search(token):
+            return token, (), "plain", False
+        plain = PLAIN_TOKEN.fullmatch(token)
+        if plain is None:
+            # Letters joined by hyphens, apostrophes or digits keep their context
+            result = self.normalizer.normalize_detailed(token)
+            changes = relative_changes(token, result.changes)
+            return result.normalized, changes, "rules", False
+        lead, word, trail = plain.groups()
+        normalized, changes, missed = self._word(word)
+        if lead:
+            changes = tuple((len(lead) + offset, *rest) for offset, *rest in changes)
+        return f"{lead}{normalized}{trail}", changes, "word", missed
+
+    def normalize_detailed(self, text: str) -> NormalizedText:
+        """Normalize ``text`` word by word, applying the rules only to unseen words."""
+        # Even items are tokens, odd items the whitespace between them
+        parts = WHITESPACE.split(text)
+        changes: List[UVChange] = []
+        seen: Dict[str, Tuple[str, Tuple[RelativeChange, ...], str, bool]] = {}
+        counts: Counter = Counter()
+        offset = 0
+        for i in range(0, len(parts), 2):
+            token = parts[i]
+            result = seen.get(token)
+            if result is None:
+                result = seen[token] = self._token(token)
+                counts["misses"] += result[3]
+            parts[i] = result[0]
+            for relative, original, normalized, rule in result[1]:
+                position = offset + relative
+                context = text[max(0, position - CONTEXT_CHARS) : position + CONTEXT_CHARS + 1]
+                changes.append(UVChange(position, original, normalized, rule, context))
+            counts[result[2]] += 1
+            offset += len(token) + (len(parts[i + 1]) if i + 1 < len(parts) else 0)
+        with self._lock:
+            self.hits += counts["word"] - counts["misses"]
+            self.misses += counts["misses"]
+            self.uncached += counts["rules"]
+        return NormalizedText(text, "".join(parts), changes)
+
+    def normalize(self, text: str) -> str:
+        return self.normalize_detailed(text).normalized
+
+    def normalize_tokens(self, tokens: Iterable[str]) -> Dict[str, str]:
+        """Map each distinct token (with no whitespace) to its normalized form."""
+        results = {token: self._token(token) for token in set(tokens)}
+        kinds = Counter(result[2] for result in results.values())
+        misses = sum(result[3] for result in results.values())
+        with self._lock:
+            self.hits += kinds["word"] - misses
+            self.misses += misses
+            self.uncached += kinds["rules"]
+        return {token: result[0] for token, result in results.items()}
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._words),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "uncached": self.uncached,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Characters per chunk sent to a worker; chunks break at paragraph boundaries
+CHUNK_CHARS = 20_000
+
+_normalizer = None
+
+
+def _process_normalizer() -> CachedNormalizer:
+    """Return this process's normalizer, creating it on first use."""
+    global _normalizer
+    if _normalizer is None:
+        from latincy_uv import UVNormalizerRules
+
+        _normalizer = CachedNormalizer(UVNormalizerRules())
+    return _normalizer
+
+
+def normalize_chunk(chunk: str) -> Tuple[str, Counter]:
+    """Normalize one chunk, returning the text and its changes per rule."""
+    result = _process_normalizer().normalize_detailed(chunk)
+    return result.normalized, count_rules(result.changes)
+
+
+def normalize_corpus(
+    texts: List[Tuple[str, str]],
+    n_workers: int = 1,
+    chunk_chars: int = CHUNK_CHARS,
+    on_chunk: Optional[Callable[[int, int], None]] = None,
+) -> Tuple[List[Tuple[str, str, int]], Counter]:
+    """Normalize (name, text) pairs in paragraph chunks across ``n_workers`` processes.
+
+    Returns (name, normalized text, number of changes) for every text, in
+    input order, and the number of changes made by each rule.
+    """
+    chunks = []
+    owners = []
+    for text_idx, (_, text) in enumerate(texts):
+        for chunk in chunk_paragraphs(text, chunk_chars):
+            chunks.append(chunk)
+            owners.append(text_idx)
+
+    parts: List[List[str]] = [[] for _ in texts]
+    n_changes = [0] * len(texts)
+    rules: Counter = Counter()
+    executor = None
+    if n_workers > 1 and len(chunks) > 1:
+        # Spawn rather than fork: forking the multithreaded Streamlit server can
+        # copy a lock held by another thread and hang the worker
+        executor = ProcessPoolExecutor(
+            n_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+    try:
+        if executor is None:
+            results = map(normalize_chunk, chunks)
+        else:
+            # map() yields in submission order, so chunks reassemble in place
+            chunksize = max(1, len(chunks) // (n_workers * 4))
+            results = executor.map(normalize_chunk, chunks, chunksize=chunksize)
+        for done, (owner, (normalized, chunk_rules)) in enumerate(zip(owners, results), 1):
+            parts[owner].append(normalized)
+            n_changes[owner] += sum(chunk_rules.values())
+            rules.update(chunk_rules)
+            if on_chunk is not None:
+                on_chunk(done, len(chunks))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    outputs = [
+        (name, "".join(text_parts), changes)
+        for (name, _), text_parts, changes in zip(texts, parts, n_changes)
+    ]
+    return outputs, rules
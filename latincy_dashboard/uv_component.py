@@ -0,0 +1,89 @@
+"""The ``uv_normalizer`` pipeline component.
+
+Importing this module registers the ``uv_normalizer`` factory and the
+``Token._.uv_norm`` / ``Doc._.uv_text`` extensions. Each distinct form is
+normalized once per batch and memoised across batches by
+``CachedNormalizer``. Pages use ``analyze_uv``, which runs one shared
+component on the shared pipeline's cached Doc instead of loading a second
+copy of the pipeline with the component added.
+"""
+
+from typing import Iterable, Iterator
+
+import streamlit as st
+from spacy.attrs import ORTH
+from spacy.language import Language
+from spacy.tokens import Doc, Token
+from spacy.util import minibatch
+
+from latincy_dashboard.docs import analyze
+from latincy_dashboard.models import get_model
+from latincy_dashboard.uv import WORD_CACHE_SIZE, CachedNormalizer
+
+if not Token.has_extension("uv_norm"):
+    # Normalized u/v spelling of each token
+    Token.set_extension("uv_norm", default=None)
+
+if not Doc.has_extension("uv_text"):
+    Doc.set_extension(
+        "uv_text",
+        getter=lambda doc: "".join(
+            (token._.uv_norm or token.text) + token.whitespace_ for token in doc
+        ),
+    )
+
+
+@Language.factory(
+    "uv_normalizer", default_config={"set_norm": False, "cache_size": WORD_CACHE_SIZE}
+)
+def create_uv_normalizer(nlp, name, set_norm: bool, cache_size: int):
+    return UVNormalizerComponent(set_norm=set_norm, cache_size=cache_size)
+
+
+class UVNormalizerComponent:
+    def __init__(self, set_norm: bool = False, cache_size: int = WORD_CACHE_SIZE, rules=None):
+        if rules is None:
+            from latincy_uv import UVNormalizerRules
+
+            rules = UVNormalizerRules()
+        self.set_norm = set_norm
+        self.normalizer = CachedNormalizer(rules, max_size=cache_size)
+
+    def _annotate(self, docs) -> None:
+        # Normalize each distinct form in the batch once
+        forms = {
+            doc.vocab.strings[int(orth)]
+            for doc in docs
+            for orth in set(doc.to_array(ORTH).tolist())
+        }
+        normalized = self.normalizer.normalize_tokens(form for form in forms if form.strip())
+        for doc in docs:
+            for token in doc:
+                form = normalized.get(token.text, token.text)
+                token._.uv_norm = form
+                if self.set_norm:
+                    token.norm_ = form.lower()
+
+    def __call__(self, doc: Doc) -> Doc:
+        self._annotate([doc])
+        return doc
+
+    def pipe(self, stream: Iterable[Doc], batch_size: int = 128) -> Iterator[Doc]:
+        for docs in minibatch(stream, size=batch_size):
+            self._annotate(docs)
+            yield from docs
+
+
+@st.cache_resource
+def get_uv_normalizer() -> UVNormalizerComponent:
+    """Get the normalizer component shared by every session in this process."""
+    return UVNormalizerComponent()
+
+
+def analyze_uv(model_name: str, text: str) -> Doc:
+    """Analyse ``text`` with the shared ``model_name`` pipeline and normalize its tokens.
+
+    The Doc comes from the shared Doc cache, like on the other pages; the
+    normalizer then annotates it in place.
+    """
+    return get_uv_normalizer()(analyze(get_model(model_name), text))
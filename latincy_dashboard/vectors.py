@@ -0,0 +1,188 @@
+"""Vectorized similarity search over LatinCy word vectors.
+
+Candidate matrices can be stored as float32, float16, or int8 with one
+float32 scale per row, trading a little precision for 2-4x less memory;
+``scripts/bench_vectors.py`` reports the trade-off.
+
+Floret computes the vector of every form, in or out of vocabulary, by
+hashing its character n-grams. ``VectorCache`` memoises those vectors so
+repeated forms are hashed once per process. It holds only the vector rows;
+the vocab is passed on each lookup, so a cache never keeps an evicted
+pipeline's vector table alive.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from spacy.attrs import NORM
+from spacy.vocab import Vocab
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Scale each row to unit length as float32, leaving zero rows at zero."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Return the indices of the ``k`` highest scores in each row, best first."""
+    k = min(k, scores.shape[-1])
+    if k <= 0:
+        return np.empty(scores.shape[:-1] + (0,), dtype=np.int64)
+    part = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    order = np.argsort(-np.take_along_axis(scores, part, axis=-1), axis=-1, kind="stable")
+    return np.take_along_axis(part, order, axis=-1)
+
+
+VECTOR_DTYPES = ("float32", "float16", "int8")
+
+# Rows upcast to float32 at a time when scoring a compact matrix
+SCORE_CHUNK_SIZE = 4096
+
+
+def quantize(matrix: np.ndarray, dtype: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Store ``matrix`` as ``dtype``, returning the data and per-row int8 scales."""
+    if dtype == "float32":
+        return np.ascontiguousarray(matrix, dtype=np.float32), None
+    if dtype == "float16":
+        return matrix.astype(np.float16), None
+    if dtype == "int8":
+        scales = np.abs(matrix).max(axis=1) / 127
+        scales[scales == 0] = 1
+        data = np.round(matrix / scales[:, None]).astype(np.int8)
+        return data, scales.astype(np.float32)
+    raise ValueError(f"Unknown vector dtype {dtype!r}; expected one of {VECTOR_DTYPES}")
+
+
+def cosine(a: np.ndarray, b: np.ndarray) -> float:
+    """Cosine similarity of two vectors, 0.0 if either is all zeros."""
+    norm = float(np.linalg.norm(a) * np.linalg.norm(b))
+    return float(np.dot(a, b)) / norm if norm else 0.0
+
+
+def pairwise_similarity(vectors: np.ndarray) -> np.ndarray:
+    """Cosine similarity of every row against every other row in one product."""
+    unit = normalize_rows(vectors)
+    return np.clip(unit @ unit.T, -1.0, 1.0)
+
+
+# Word vectors memoised per pipeline by VectorCache
+VECTOR_CACHE_SIZE = 50_000
+
+
+class VectorCache:
+    """Least-recently-used cache of word vectors for one model's vector table."""
+
+    def __init__(self, max_size: int = VECTOR_CACHE_SIZE):
+        self.max_size = max_size
+        self._vectors: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._vectors)
+
+    @staticmethod
+    def _compute(vocab: Vocab, words: List[str]) -> np.ndarray:
+        vectors = vocab.vectors
+        if vectors.mode != "floret":
+            return np.vstack([vocab.get_vector(word) for word in words])
+        # Vectors are keyed on ORTH unless the table was configured for NORM
+        attr = "norm" if vectors.attr == NORM else "orth"
+        keys = [getattr(vocab[word], attr) for word in words]
+        # One batch hashes the n-grams of every new form together
+        return np.asarray(vectors.get_batch(keys), dtype=np.float32)
+
+    def get(self, vocab: Vocab, words: Sequence[str]) -> np.ndarray:
+        """Return one vector row per word, computing only the uncached ones from ``vocab``."""
+        with self._lock:
+            missing = [word for word in dict.fromkeys(words) if word not in self._vectors]
+            self.misses += len(missing)
+            self.hits += len(words) - len(missing)
+            if missing:
+                for word, vector in zip(missing, self._compute(vocab, missing)):
+                    vector.flags.writeable = False
+                    self._vectors[word] = vector
+            rows = []
+            for word in words:
+                self._vectors.move_to_end(word)
+                rows.append(self._vectors[word])
+            while len(self._vectors) > self.max_size:
+                self._vectors.popitem(last=False)
+        if not rows:
+            return np.zeros((0, vocab.vectors_length), dtype=np.float32)
+        return np.vstack(rows)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._vectors),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class CandidateIndex:
+    """Row-normalised matrix of candidate vectors with a word index."""
+
+    def __init__(self, words: Sequence[str], matrix: np.ndarray, dtype: str = "float32"):
+        self.words = list(words)
+        self.dtype = dtype
+        self.matrix, self.scales = quantize(normalize_rows(matrix), dtype)
+        self.index = {word: i for i, word in enumerate(self.words)}
+
+    def __len__(self):
+        return len(self.words)
+
+    @property
+    def nbytes(self) -> int:
+        scales = self.scales.nbytes if self.scales is not None else 0
+        return self.matrix.nbytes + scales
+
+    def scores(self, queries: np.ndarray) -> np.ndarray:
+        """Cosine similarity of each query row against every candidate."""
+        queries = normalize_rows(np.atleast_2d(queries))
+        if self.dtype == "float32":
+            return queries @ self.matrix.T
+        # Upcast a chunk of rows at a time so scoring never needs a float32 copy
+        scores = np.empty((len(queries), len(self.words)), dtype=np.float32)
+        for start in range(0, len(self.words), SCORE_CHUNK_SIZE):
+            chunk = self.matrix[start : start + SCORE_CHUNK_SIZE].astype(np.float32)
+            scores[:, start : start + SCORE_CHUNK_SIZE] = queries @ chunk.T
+        if self.scales is not None:
+            scores *= self.scales
+        return scores
+
+    def search(
+        self, words: Sequence[str], queries: np.ndarray, n_results: int
+    ) -> List[List[Tuple[str, float]]]:
+        """Return the ``n_results`` nearest candidates for each query, skipping the query word."""
+        scores = self.scores(queries)
+        # Fetch one extra so the query word itself can be dropped
+        best = top_k(scores, n_results + 1)
+        results = []
+        for word, row, idx in zip(words, scores, best):
+            hits = [(self.words[i], float(row[i])) for i in idx if self.words[i] != word]
+            results.append(hits[:n_results])
+        return results
+
+
+def build_candidate_index(
+    vocab: Vocab, candidates: Sequence[str], dtype: str = "float32"
+) -> CandidateIndex:
+    """Pre-compute the vectors for every candidate that has one."""
+    words = []
+    rows = []
+    for word in candidates:
+        lexeme = vocab[word]
+        if lexeme.has_vector:
+            words.append(word)
+            rows.append(lexeme.vector)
+    matrix = np.vstack(rows) if rows else np.zeros((0, vocab.vectors_length), dtype=np.float32)
+    return CandidateIndex(words, matrix, dtype=dtype)
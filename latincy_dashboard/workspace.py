@@ -0,0 +1,103 @@
+"""Session workspace shared by the demo pages.
+
+The workspace holds the text the user last analysed on any page and, for
+each pipeline that has analysed it, the resulting Doc as DocBin bytes.
+Pages prefill their text areas from it and render its Docs as soon as they
+open, so moving between pages costs a DocBin load and rendering; a model
+only runs when the text or the pipeline changes, and then only on the
+edited sentences (see ``latincy_dashboard.incremental``). Pages that show
+sentence boundaries or parses share the text but analyse it in one pass
+with ``latincy_dashboard.docs.analyze``.
+"""
+
+from typing import Any, Dict, Optional, Tuple
+
+import streamlit as st
+from spacy.language import Language
+from spacy.tokens import Doc
+
+from latincy_dashboard.docs import DocKey, analyze, doc_from_bytes, doc_key, doc_to_bytes
+from latincy_dashboard.incremental import get_session_analyzer
+
+
+class Workspace:
+    """The session's current text and its analysed Docs, one per pipeline."""
+
+    def __init__(self):
+        self.text: Optional[str] = None
+        # (model, version, config, text hash) -> (serialized Doc, segment count)
+        self._docs: Dict[DocKey, Tuple[bytes, int]] = {}
+        self.last_run: Dict[str, Any] = {"segments": 0, "analysed": 0}
+
+    def set_text(self, text: str):
+        """Make ``text`` the current text, dropping Docs of the previous one."""
+        if text != self.text:
+            self.text = text
+            self._docs.clear()
+
+    def doc(self, nlp: Language, text: Optional[str] = None) -> Doc:
+        """Return ``text`` (by default the current text) analysed by ``nlp``.
+
+        Pages that trim the text pass the trimmed version; it is cached
+        alongside the full text until the current text changes.
+        """
+        text = self.text if text is None else text
+        key = doc_key(nlp, text)
+        cached = self._docs.get(key)
+        if cached is not None:
+            data, n_segments = cached
+            self.last_run = {"segments": n_segments, "analysed": 0}
+            return doc_from_bytes(nlp, data)
+        analyzer = get_session_analyzer(nlp)
+        doc = analyzer.analyze(nlp, text)
+        self.last_run = dict(analyzer.last_run)
+        self._docs[key] = (doc_to_bytes(doc), self.last_run["segments"])
+        return doc
+
+    def current_doc(
+        self,
+        nlp: Language,
+        submitted: bool,
+        text: str,
+        max_tokens: Optional[int] = None,
+        incremental: bool = True,
+    ) -> Optional[Doc]:
+        """Return a page's Doc of the current text, or None until one has been analysed.
+
+        ``submitted`` is the page's analyse button: pressing it makes
+        ``text`` the current text, and text analysed on any page is shown
+        on the others straight away. Texts over ``max_tokens`` words are
+        trimmed with a warning. Pages showing sentences or parses pass
+        ``incremental=False`` to analyse the text in one pass.
+        """
+        if submitted:
+            self.set_text(text)
+        if self.text is None:
+            return None
+        text = self.text
+        if max_tokens is not None:
+            tokens = text.split()
+            if len(tokens) > max_tokens:
+                st.warning(f"Text trimmed to ~{max_tokens} tokens.")
+                text = " ".join(tokens[:max_tokens])
+        if not incremental:
+            return analyze(nlp, text)
+        doc = self.doc(nlp, text)
+        self.show_last_run()
+        return doc
+
+    def show_last_run(self):
+        """Caption how much of the text the last ``doc`` call re-analysed."""
+        run = self.last_run
+        st.caption(f"Re-analysed {run['analysed']} of {run['segments']} segments.")
+
+
+def get_workspace() -> Workspace:
+    """Get this session's workspace."""
+    return st.session_state.setdefault("workspace", Workspace())
+
+
+def workspace_text(default: str) -> str:
+    """Return the workspace text, or ``default`` until a page has set one."""
+    text = get_workspace().text
+    return default if text is None else text
@@ -1,11 +1,14 @@
 import streamlit as st
-import spacy
 import pandas as pd
 import datetime
-import gc
-import subprocess
-import json
-from spacy.util import registry
+import os
+import time
+
+from latincy_dashboard.conllu import COLUMNS, doc_to_columns
+from latincy_dashboard.corpus import iter_paragraphs, pipe_paragraphs, read_uploads
+from latincy_dashboard.export import EXPORT_FORMATS, write_export
+from latincy_dashboard.workspace import get_workspace, workspace_text
+from latincy_dashboard.models import get_model
 
 st.set_page_config(page_title="Parsing Demo", layout="wide")
 st.sidebar.header("Parsing Demo")
@@ -13,135 +16,110 @@ st.sidebar.header("Parsing Demo")
 default_text = """Ita fac, mi Lucili; vindica te tibi, et tempus, quod adhuc aut auferebatur aut subripiebatur aut excidebat, collige et serva."""
 
 
-def format_morph(morph):
-    morph = morph.to_dict()
-    if morph:
-        return ", ".join([f"{k}={v}" for k, v in morph.items()])
-    else:
-        return ""
-
-
-def analyze_text(text):
-    doc = nlp(text)
-    rows = []
-    token_count = 0
-    for sent_idx, sent in enumerate(doc.sents):
-        sent_id = f"s{sent_idx + 1}"
-        sent_start = sent.start
-        for token_idx, token in enumerate(sent):
-            if token_count >= 500:
-                break
-            token_id = token_idx + 1
-            if token.head == token:
-                head = 0
-            else:
-                head = token.head.i - sent_start + 1
-            rows.append(
-                (
-                    sent_id,
-                    token_id,
-                    token.text,
-                    token.lemma_,
-                    token.pos_,
-                    token.tag_,
-                    format_morph(token.morph),
-                    head,
-                    token.dep_,
-                    token.ent_type_,
-                )
+def analyze_corpus(texts, batch_size, n_process, export_format, progress):
+    """Parse every paragraph of every text, streaming the export to a spool."""
+    paragraphs = list(iter_paragraphs(texts))
+    stats = {"tokens": 0}
+    start = time.perf_counter()
+
+    def items():
+        docs = pipe_paragraphs(nlp, model_name, paragraphs, batch_size, n_process)
+        for done, (doc, name, par_idx) in enumerate(docs, 1):
+            yield doc, name, par_idx
+            stats["tokens"] += len(doc)
+            elapsed = max(time.perf_counter() - start, 1e-9)
+            progress.progress(
+                done / len(paragraphs),
+                text=f"{done}/{len(paragraphs)} paragraphs, {stats['tokens'] / elapsed:,.0f} tokens/s",
             )
-            token_count += 1
-        if token_count >= 500:
-            break
-    df = pd.DataFrame(
-        rows,
-        columns=[
-            "sent_id",
-            "token_id",
-            "form",
-            "lemma",
-            "upos",
-            "xpos",
-            "feats",
-            "head",
-            "deprel",
-            "ent_type",
-        ],
-    )
-    return df
 
+    spool = write_export(items(), export_format)
+    return spool, stats["tokens"], time.perf_counter() - start
 
-st.title("LatinCy Text Analyzer")
 
-# Using object notation
-first_model = "la_core_web_lg"
-first_model_version = spacy.info(first_model)["version"]
-
-
-# Function to unload the current model
-@st.cache_resource
-def load_model(model_name):
-    gc.collect()  # Attempt to free memory
-    nlp = spacy.load(model_name)
-    try:
-        if "trf_vectors" in nlp.pipe_names:  # Disable trf_vectors if it exists
-            nlp.disable_pipe("trf_vectors")
-    except Exception as e:
-        st.warning(f"Failed to disable 'trf_vectors': {e}")
-    return nlp
-
-
-# Function to load model in a subprocess to avoid conflicts
-def load_model_in_subprocess(model_name):
-    script = (
-        "import spacy, json; "
-        'nlp = spacy.load("' + model_name + '"); '
-        "print(json.dumps(nlp.meta))"
-    )
-    result = subprocess.run(["python", "-c", script], capture_output=True, text=True)
-    if result.returncode != 0:
-        raise RuntimeError(f"Failed to load model {model_name}: {result.stderr}")
-    return json.loads(result.stdout)
+def download_export(spool, export_format, prefix, key):
+    extension, mime = EXPORT_FORMATS[export_format]
+    with spool:
+        st.download_button(
+            f"Download {export_format}",
+            spool.read(),
+            f"{prefix}-{create_timestamp()}.{extension}",
+            mime,
+            key=key,
+        )
+
+
+def create_timestamp():
+    return datetime.datetime.now().strftime("%Y%m%d%H%M%S")
 
 
+st.title("LatinCy Text Analyzer")
+
 model_name = "la_core_web_lg"  # Hardcoded to use only the lg model
-nlp = spacy.load(model_name)  # Directly load the lg model
+nlp = get_model(model_name)
+workspace = get_workspace()
 
-st.write(f"Loaded model: {model_name} (v{spacy.info(model_name)['version']})")
+st.write(f"Loaded model: {model_name} (v{nlp.meta['version']})")
 
 df = None
 
-tab1, tab2 = st.tabs(["Analyze", "About"])
+tab1, tab_batch, tab2 = st.tabs(["Analyze", "Batch", "About"])
 
 with tab1:
     text = st.text_area(
-        "Enter some text to analyze (max 500 tokens)", value=default_text, height=200
+        "Enter some text to analyze (max 500 tokens)",
+        value=workspace_text(default_text),
+        height=200,
     )
-    if st.button("Analyze"):
-        df = analyze_text(text)
+    text_format = st.selectbox("Download format", list(EXPORT_FORMATS), key="text_format")
+    # Sentence ids and heads depend on the segmentation, so parse in one pass
+    doc = workspace.current_doc(nlp, st.button("Analyze"), text, incremental=False)
+    if doc is not None:
+        df = pd.DataFrame(doc_to_columns(doc, max_tokens=500), columns=COLUMNS)
         sent_count = df["sent_id"].nunique()
         st.text(f"Analyzed {len(df)} tokens in {sent_count} sentences with {model_name} model.")
         st.dataframe(df, width=1200, hide_index=True)
 
-        @st.cache_data
-        def convert_df(df):
-            return df.to_csv(index=False, sep="\t").encode("utf-8")
-
-        csv = convert_df(df)
-
-        def create_timestamp():
-            return datetime.datetime.now().strftime("%Y%m%d%H%M%S")
-
         # nb: clicking this button resets app! Open streamlit issue, as of 4.15.2023; cf. https://github.com/streamlit/streamlit/issues/4382
         st.markdown("*NB: Clicking the download button will reset the app after download!*")
-        st.download_button(
-            "Press to Download",
-            csv,
-            f"latincy-analysis-{create_timestamp()}.tsv",
-            "text/csv",
+        download_export(
+            write_export([(doc, "", 0)], text_format),
+            text_format,
+            "latincy-analysis",
             key="download-csv",
         )
 
+with tab_batch:
+    uploaded_files = st.file_uploader(
+        "Upload .txt files or a .zip of .txt files",
+        type=["txt", "zip"],
+        accept_multiple_files=True,
+    )
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        batch_size = st.number_input("Batch size", min_value=1, max_value=1000, value=64)
+    with col2:
+        n_process = st.number_input(
+            "Processes", min_value=1, max_value=os.cpu_count() or 1, value=1
+        )
+    with col3:
+        export_format = st.selectbox("Export format", list(EXPORT_FORMATS), index=1)
+    if st.button("Parse corpus") and uploaded_files:
+        texts = read_uploads(uploaded_files)
+        if not texts:
+            st.warning("No .txt files found in the upload.")
+        else:
+            progress = st.progress(0.0, text="Parsing...")
+            spool, token_count, elapsed = analyze_corpus(
+                texts, int(batch_size), int(n_process), export_format, progress
+            )
+            st.text(
+                f"Parsed {token_count:,} tokens from {len(texts)} file(s) in "
+                f"{elapsed:.1f}s ({token_count / max(elapsed, 1e-9):,.0f} tokens/s) "
+                f"with {model_name} model."
+            )
+            download_export(spool, export_format, "latincy-corpus", key="download-conllu")
+
 with tab2:
     st.markdown("""
     ## About
@@ -166,7 +144,20 @@ with tab2:
 
     ### Notes
 
-    - Output is limited to 500 tokens
-    - TSV export follows [CoNLL-U format](https://universaldependencies.org/format.html)
+    - The table is limited to 500 tokens on the Analyze tab; downloads cover the full text
+    - The Batch tab parses whole uploaded works (many `.txt` files or a `.zip`)
+      with `nlp.pipe`, with no token limit, and exports a single file
+    - With more than one process, each worker process loads its own copy of
+      the model
+    - TSV export uses the columns above; CoNLL-U export follows the
+      [CoNLL-U format](https://universaldependencies.org/format.html), with
+      `# sent_id` and `# text` comments and entity types in the MISC column
+    - Parquet and Arrow IPC exports store upos/xpos/feats/deprel/ent_type as
+      categoricals and reload with `pd.read_parquet` or `pyarrow.ipc.open_stream`
+    - DocBin export keeps the full spaCy annotation; reload it with
+      `DocBin().from_disk(path).get_docs(nlp.vocab)`
+    - TSV, CoNLL-U, Parquet and Arrow exports are written sentence by sentence
+      to a temporary file rather than built as one table; the download button
+      still holds the finished file in memory once
     - Powered by [LatinCy](https://github.com/diyclassics/latincy)
     """)
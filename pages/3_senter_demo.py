@@ -1,25 +1,25 @@
 import streamlit as st
-import spacy
 import datetime
 
+from latincy_dashboard.models import get_model
+from latincy_dashboard.workspace import get_workspace, workspace_text
+
 st.set_page_config(page_title="Sentence Segmenter", layout="wide")
 st.sidebar.header("Sentence Segmenter")
 
 
 # Load spaCy model (Latin large)
-@st.cache_resource
-def load_model():
-    return spacy.load("la_core_web_lg")
-
-
-nlp = load_model()
+nlp = get_model("la_core_web_lg")
+workspace = get_workspace()
 
 st.title("Latin Sentence Segmenter")
 
+default_text = "Lucius Catilina, nobili genere natus, fuit magna vi et animi et corporis, sed ingenio malo pravoque. Huic ab adulescentia bella intestina, caedes, rapinae, discordia civilis grata fuere ibique iuventutem suam exercuit. Corpus patiens inediae, algoris, vigiliae supra quam cuiquam credibile est. Animus audax, subdolus, varius, cuius rei lubet simulator ac dissimulator, alieni adpetens, sui profusus, ardens in cupiditatibus; satis eloquentiae, sapientiae parum. Vastus animus inmoderata, incredibilia, nimis alta semper cupiebat."
+
 # Input text area
 text = st.text_area(
     "Enter a paragraph of Latin text to segment into sentences:",
-    value="Lucius Catilina, nobili genere natus, fuit magna vi et animi et corporis, sed ingenio malo pravoque. Huic ab adulescentia bella intestina, caedes, rapinae, discordia civilis grata fuere ibique iuventutem suam exercuit. Corpus patiens inediae, algoris, vigiliae supra quam cuiquam credibile est. Animus audax, subdolus, varius, cuius rei lubet simulator ac dissimulator, alieni adpetens, sui profusus, ardens in cupiditatibus; satis eloquentiae, sapientiae parum. Vastus animus inmoderata, incredibilia, nimis alta semper cupiebat.",
+    value=workspace_text(default_text),
     height=200,
 )
 
@@ -27,8 +27,9 @@ tab1, tab2 = st.tabs(["Segment", "About"])
 
 with tab1:
     sentences = []
-    if st.button("Segment Sentences"):
-        doc = nlp(text)
+    # The segmentation is the output, so the senter always sees the whole text
+    doc = workspace.current_doc(nlp, st.button("Segment Sentences"), text, incremental=False)
+    if doc is not None:
         sentences = [sent.text.strip() for sent in doc.sents]
         st.success(f"Found {len(sentences)} sentences.")
 
@@ -1,7 +1,9 @@
 import streamlit as st
-import spacy
 from spacy_streamlit import visualize_ner
 
+from latincy_dashboard.models import get_model
+from latincy_dashboard.workspace import get_workspace, workspace_text
+
 st.set_page_config(page_title="NER Demo", layout="wide")
 st.sidebar.header("NER Demo")
 
@@ -25,27 +27,20 @@ model_selectbox = st.sidebar.selectbox(
     "Choose model:", ("la_core_web_lg", "la_core_web_md", "la_core_web_sm")
 )
 
-
-@st.cache_resource
-def load_model(model_name):
-    return spacy.load(model_name)
-
-
-nlp = load_model(model_selectbox)
+nlp = get_model(model_selectbox)
+workspace = get_workspace()
 
 tab1, tab2 = st.tabs(["Recognize", "About"])
 
 with tab1:
     text = st.text_area(
-        "Enter Latin text to analyze (max ~200 tokens):", value=default_text, height=200
+        "Enter Latin text to analyze (max ~200 tokens):",
+        value=workspace_text(default_text),
+        height=200,
     )
 
-    if st.button("Find Entities"):
-        tokens = text.split()
-        if len(tokens) > 200:
-            st.warning("Text trimmed to ~200 tokens.")
-            text = " ".join(tokens[:200])
-        doc = nlp(text)
+    doc = workspace.current_doc(nlp, st.button("Find Entities"), text, max_tokens=200)
+    if doc is not None:
         ner_labels = nlp.get_pipe("ner").labels
         visualize_ner(doc, labels=ner_labels, show_table=False, title="")
 
@@ -1,12 +1,40 @@
+import hashlib
+import math
+
 import streamlit as st
-import spacy
-from spacy_streamlit import visualize_parser
+from spacy import displacy
+from spacy_streamlit.util import get_svg
+
+from latincy_dashboard.models import get_model
+from latincy_dashboard.workspace import get_workspace, workspace_text
 
 st.set_page_config(page_title="Dependency Demo", layout="wide")
 st.sidebar.header("Dependency Demo")
 
 default_text = """Haec narrantur a poetis de Perseo. Perseus filius erat Iovis, maximi deorum; avus eius Acrisius appellabatur."""
 
+SENTS_PER_PAGE = 5
+
+
+def sentence_key(sent):
+    """Hash a sentence's tokens and parse, so identical trees share one rendering."""
+    parse = "\n".join(
+        f"{t.text}\t{t.pos_}\t{t.dep_}\t{t.head.i - sent.start}" for t in sent
+    )
+    return hashlib.sha1(parse.encode("utf-8")).hexdigest()
+
+
+@st.cache_data(max_entries=2048)
+def render_sentence(sent_hash, model_name, compact, _sent):
+    """Render one sentence's tree as an SVG image, cached per (sentence, model, compact)."""
+    html = displacy.render(
+        _sent.as_doc(),
+        style="dep",
+        options={"compact": compact, "collapse_punct": True},
+    )
+    # Double newlines seem to mess with the rendering
+    return get_svg(html.replace("\n\n", "\n"))
+
 st.title("Latin Dependency Tree Visualizer")
 
 st.markdown(
@@ -31,38 +59,47 @@ model_selectbox = st.sidebar.selectbox(
 
 compact = st.sidebar.checkbox("Compact mode", value=False)
 
-
-@st.cache_resource
-def load_model(model_name):
-    return spacy.load(model_name)
-
-
-nlp = load_model(model_selectbox)
+nlp = get_model(model_selectbox)
+workspace = get_workspace()
 
 tab1, tab2 = st.tabs(["Parse", "About"])
 
 with tab1:
     text = st.text_area(
         "Enter Latin text (keep to 3–5 sentences for readable trees):",
-        value=default_text,
+        value=workspace_text(default_text),
         height=200,
     )
 
-    if st.button("Parse"):
-        doc = nlp(text)
+    parse = st.button("Parse")
+    if parse:
+        st.session_state["dep_page"] = 1
+
+    # Trees need whole sentences, so the text is parsed in one pass; the Doc
+    # cache makes paging and toggling compact mode only render, and trees
+    # already drawn come straight from the SVG cache
+    doc = workspace.current_doc(nlp, parse, text, incremental=False)
+    if doc is not None:
         sents = list(doc.sents)
-        if len(sents) > 10:
-            st.warning("Showing first 10 sentences only.")
-            sents = sents[:10]
-        for i, sent in enumerate(sents):
-            st.markdown(f"**Sentence {i + 1}**")
-            sent_doc = nlp(sent.text)
-            visualize_parser(
-                sent_doc,
-                title="",
-                displacy_options={"compact": compact},
-                key=f"dep_sent_{i}",
+        n_pages = max(math.ceil(len(sents) / SENTS_PER_PAGE), 1)
+        # Another page may have changed the text since this page was last shown
+        if st.session_state.get("dep_page", 1) > n_pages:
+            st.session_state["dep_page"] = 1
+        if n_pages > 1:
+            page = st.number_input(
+                f"Page (of {n_pages}, {len(sents)} sentences)",
+                min_value=1,
+                max_value=n_pages,
+                key="dep_page",
             )
+        else:
+            page = 1
+        first = (page - 1) * SENTS_PER_PAGE
+        for i, sent in enumerate(sents[first : first + SENTS_PER_PAGE], first):
+            st.markdown(f"**Sentence {i + 1}**")
+            # Trees come from the full pass rather than re-running the model
+            svg = render_sentence(sentence_key(sent), model_selectbox, compact, sent)
+            st.write(svg, unsafe_allow_html=True)
 
 with tab2:
     st.markdown("""
@@ -91,6 +128,7 @@ with tab2:
     - Trees follow UD v2 annotation guidelines
     - The root of each sentence is the main predicate
     - Compact mode collapses the tree vertically for long sentences
+    - Long texts are shown 5 sentences per page; only the visible trees are drawn
     - Trained on 5 Latin UD treebanks: Perseus, PROIEL, ITTB, LLCT, UDante
 
     ### Reference
@@ -1,6 +1,19 @@
+import os
+from pathlib import Path
+
+import altair as alt
+import pandas as pd
 import streamlit as st
-import spacy
-import numpy as np
+
+from latincy_dashboard.ann import IVFIndex
+from latincy_dashboard.dcc import load_core_lemmas
+from latincy_dashboard.models import get_vectors_model
+from latincy_dashboard.vectors import (
+    VectorCache,
+    build_candidate_index,
+    cosine,
+    pairwise_similarity,
+)
 
 st.set_page_config(page_title="Similarity Demo", layout="wide")
 st.sidebar.header("Similarity Demo")
@@ -21,177 +34,101 @@ model_selectbox = st.sidebar.selectbox(
     "Choose model:", ("la_core_web_lg", "la_core_web_md")
 )
 
+# Only the vocab and floret vector table are needed, so no components are loaded
+nlp = get_vectors_model(model_selectbox)
+
+# Curated candidate list: common Latin lemmas from DCC Core Vocabulary.
+# This is necessary because floret vectors don't support most_similar().
+CANDIDATES = load_core_lemmas()
+
+
+# Storage for the candidate matrix: float32, float16, or per-row-scaled int8
+VECTOR_DTYPE = os.environ.get("LATINCY_VECTOR_DTYPE", "float32")
+
 
 @st.cache_resource
-def load_model(model_name):
-    return spacy.load(model_name, exclude=["ner", "parser", "senter"])
+def get_candidate_index(model_name, candidates, dtype, _nlp):
+    """Pre-compute a row-normalised matrix of candidate vectors, once per model."""
+    return build_candidate_index(_nlp.vocab, candidates, dtype=dtype)
 
 
-nlp = load_model(model_selectbox)
+candidate_index = get_candidate_index(model_selectbox, CANDIDATES, VECTOR_DTYPE, nlp)
 
-# Curated candidate list: common Latin lemmas from DCC Core Vocabulary.
-# This is necessary because floret vectors don't support most_similar().
-CANDIDATES = [
-    "ab", "abeo", "absum", "ac", "accedo", "accido", "accipio", "acer",
-    "acies", "ad", "addo", "adduco", "adeo", "adhibeo", "adhuc", "adsum",
-    "aduenio", "aduersus", "aedes", "aeger", "aequus", "aer", "aes",
-    "aetas", "aeternus", "ager", "agito", "agmen", "ago", "aio", "albus",
-    "alienus", "aliquis", "alius", "alo", "alter", "altus", "amicitia",
-    "amicus", "amitto", "amnis", "amo", "amor", "amplus", "an", "anima",
-    "animal", "animus", "annus", "ante", "antiquus", "aperio", "appello",
-    "aptus", "apud", "aqua", "ara", "arbor", "ardeo", "argentum", "arma",
-    "ars", "arx", "ascendo", "aspicio", "astrum", "at", "atque", "auctor",
-    "auctoritas", "audax", "audeo", "audio", "aufero", "augeo", "aura",
-    "aureus", "auris", "aurum", "aut", "autem", "auxilium", "auis",
-    "barbarus", "beatus", "bellum", "bene", "bonus", "bos", "breuis",
-    "cado", "caecus", "caedes", "caelum", "campus", "canis", "cano",
-    "capio", "caput", "careo", "carmen", "carus", "castrum", "casus",
-    "causa", "cedo", "celer", "censeo", "centum", "cerno", "certus",
-    "cibus", "cingo", "ciuis", "ciuitas", "clamor", "clarus", "classis",
-    "claudo", "coepi", "cogito", "cognosco", "cogo", "colo", "color",
-    "comes", "committo", "communis", "comparo", "concedo", "condo",
-    "confero", "conficio", "coniunx", "conor", "consequor", "consilium",
-    "consisto", "constituo", "consul", "consulo", "contemno", "contineo",
-    "contra", "conuenio", "copia", "cor", "cornu", "corpus", "credo",
-    "creo", "cresco", "crimen", "culpa", "cum", "cunctus", "cupido",
-    "cupio", "cur", "cura", "curo", "curro", "currus", "cursus", "custos",
-    "damnum", "de", "debeo", "decem", "decerno", "decus", "deduco",
-    "defendo", "defero", "deinde", "denique", "descendo", "desero",
-    "desidero", "deus", "dexter", "dico", "dies", "difficilis", "dignitas",
-    "dignus", "dimitto", "discedo", "disco", "diu", "diues", "diuus", "do",
-    "doceo", "doleo", "dolor", "dolus", "dominus", "domus", "donec",
-    "donum", "dubius", "duco", "dulcis", "dum", "duo", "durus", "dux",
-    "ecce", "edo", "educo", "efficio", "ego", "egregius", "enim", "eo",
-    "eques", "equus", "ergo", "eripio", "erro", "error", "et", "etiam",
-    "ex", "excipio", "exemplum", "exeo", "exerceo", "exercitus", "exigo",
-    "existimo", "exsilium", "exspecto", "extremus",
-    "fabula", "facies", "facilis", "facinus", "facio", "fallo", "falsus",
-    "fama", "fames", "familia", "fatum", "felix", "femina", "fere", "fero",
-    "ferrum", "ferus", "fidelis", "fides", "filia", "filius", "fingo",
-    "finis", "fio", "flamma", "fleo", "flos", "flumen", "fluo", "foedus",
-    "fons", "forma", "fortis", "fortuna", "forum", "frango", "frater",
-    "frons", "fructus", "fruor", "frustra", "fuga", "fugio", "fundo",
-    "funus", "furor",
-    "gaudeo", "gaudium", "gens", "genus", "gero", "gigno", "gladius",
-    "gloria", "gradus", "gratia", "gratus", "grauis",
-    "habeo", "haud", "hic", "hiems", "homo", "honestus", "honor", "hora",
-    "hortor", "hospes", "hostis", "humanus", "humus",
-    "iaceo", "iacio", "iam", "ibi", "idem", "igitur", "ignis", "ille",
-    "imago", "imperator", "imperium", "impero", "impetus", "impleo", "in",
-    "incido", "incipio", "inde", "infero", "ingenium", "ingens",
-    "inimicus", "initium", "iniuria", "inquam", "instituo", "insula",
-    "integer", "intellego", "inter", "interficio", "intra", "inuenio",
-    "inuidia", "ipse", "ira", "is", "iste", "ita", "itaque", "iter",
-    "iterum", "iubeo", "iudex", "iudicium", "iudico", "iugum", "iungo",
-    "ius", "iustus", "iuuenis", "iuuo",
-    "labor", "laboro", "lacrima", "laetus", "lapis", "latus", "laudo",
-    "laus", "legatus", "legio", "lego", "leuis", "lex", "liber",
-    "libertas", "limen", "lingua", "littera", "litus", "locus", "longus",
-    "loquor", "lumen", "luna", "lux",
-    "magis", "magister", "magnus", "maior", "malo", "malus", "maneo",
-    "manus", "mare", "maritus", "mater", "materia", "maximus", "medius",
-    "melior", "membrum", "memini", "memoria", "mens", "mensa", "mereo",
-    "metuo", "metus", "meus", "miles", "mille", "minus", "miror", "misceo",
-    "miser", "mitto", "modus", "moenia", "mollis", "moneo", "mons", "mora",
-    "morbus", "morior", "mors", "mortalis", "mos", "moueo", "mox",
-    "mulier", "multus", "mundus", "munus", "murus", "muto",
-    "nam", "narro", "nascor", "natura", "natus", "nauis", "ne", "nec",
-    "necesse", "nego", "negotium", "nemo", "nemus", "neque", "nescio",
-    "nihil", "nimius", "nisi", "nobilis", "noceo", "nolo", "nomen", "non",
-    "nos", "nosco", "noster", "notus", "nouus", "nox", "nullus", "numen",
-    "numerus", "numquam", "nunc", "nuntius",
-    "ob", "occido", "occupo", "occurro", "oculus", "odi", "odium",
-    "offero", "olim", "omnis", "onus", "opera", "oportet", "oppidum",
-    "ops", "optimus", "opto", "opus", "oratio", "orbis", "ordo", "orior",
-    "oro", "os", "ostendo", "otium",
-    "par", "parco", "parens", "pareo", "pario", "paro", "pars", "paruus",
-    "pateo", "pater", "patior", "patria", "pauci", "pauper", "pax",
-    "pectus", "pecunia", "pecus", "pello", "per", "perdo", "pereo",
-    "periculum", "permitto", "perpetuus", "pes", "peto", "pietas", "pius",
-    "placeo", "plebs", "plenus", "plurimus", "plus", "poena", "poeta",
-    "pondus", "pono", "populus", "porta", "porto", "posco", "possum",
-    "post", "posterus", "postquam", "potens", "potestas", "praebeo",
-    "praeda", "praemium", "praesens", "praesto", "praeter", "praetor",
-    "precor", "premo", "pretium", "primus", "princeps", "prior",
-    "priuatus", "pro", "probo", "procedo", "procul", "proelium",
-    "proficiscor", "prohibeo", "promitto", "prope", "propero", "proprius",
-    "propter", "prosum", "prouincia", "publicus", "pudor", "puella",
-    "puer", "pugna", "pugno", "pulcher", "puto",
-    "quaero", "qualis", "quam", "quamquam", "quando", "quantus", "quare",
-    "quattuor", "queror", "qui", "quia", "quidam", "quidem", "quin",
-    "quis", "quisquam", "quisque", "quo", "quondam", "quoniam", "quoque",
-    "rapio", "rarus", "ratio", "recipio", "rectus", "reddo", "redeo",
-    "refero", "regio", "regnum", "rego", "relinquo", "reliquus", "reperio",
-    "res", "respicio", "respondeo", "retineo", "reus", "rex", "rogo",
-    "rumpo", "rus",
-    "sacer", "sacerdos", "saeculum", "saepe", "saeuus", "salus", "sanctus",
-    "sanguis", "sanus", "sapiens", "sapientia", "satis", "saxum", "scelus",
-    "scientia", "scio", "scribo", "secundus", "sed", "sedeo", "sedes",
-    "semper", "senatus", "senex", "sensus", "sententia", "sentio",
-    "sequor", "sermo", "seruio", "seruo", "seruus", "si", "sic", "sidus",
-    "signum", "silua", "similis", "simul", "sine", "sino", "sinus",
-    "socius", "sol", "soleo", "solus", "soluo", "somnus", "soror", "sors",
-    "spatium", "species", "specto", "spero", "spes", "spiritus", "statuo",
-    "stella", "sto", "studeo", "studium", "sub", "subeo", "subito", "sui",
-    "sum", "summus", "sumo", "super", "superbus", "supero", "supplicium",
-    "supra", "surgo", "suscipio", "sustineo", "suus",
-    "taceo", "talis", "tam", "tamen", "tandem", "tango", "tantus",
-    "tectum", "tellus", "telum", "tempestas", "templum", "tempus", "tendo",
-    "teneo", "tener", "terra", "terreo", "tertius", "testis", "timeo",
-    "timor", "tollo", "tot", "totus", "trado", "traho", "transeo", "tres",
-    "tribunus", "tristis", "tu", "tum", "turba", "turpis", "tutus", "tuus",
-    "ubi", "ullus", "ultimus", "ultra", "umbra", "umquam", "unda", "unde",
-    "unus", "urbs", "usque", "usus", "ut", "uterque", "utilis", "utor",
-    "uxor",
-    "uaco", "ualeo", "uanus", "uarius", "uates", "ueho", "uel", "uenio",
-    "uentus", "uerbum", "uereor", "uero", "uerto", "uerus", "uestigium",
-    "uestis", "uetus", "uia", "uicinus", "uictor", "uictoria", "uideo",
-    "uinco", "uinculum", "uinum", "uir", "uirgo", "uirtus", "uis",
-    "uita", "uitium", "uiuo", "uoco", "uolo", "uoluntas", "uoluptas",
-    "uos", "uotum", "uox", "uulgus", "uulnus", "uultus",
-]
-
-
-@st.cache_data
-def get_candidate_vectors(_nlp, candidates):
-    """Pre-compute vectors for all candidate words."""
-    vectors = {}
-    for word in candidates:
-        token = _nlp.vocab[word]
-        if token.has_vector:
-            vectors[word] = token.vector
-    return vectors
-
-
-candidate_vectors = get_candidate_vectors(nlp, CANDIDATES)
-
-tab1, tab2, tab3 = st.tabs(["Find Similar Words", "Compare Two Words", "About"])
+# Optional large-vocabulary index built offline by scripts/build_vector_index.py
+VECTOR_INDEX_DIR = Path(os.environ.get("LATINCY_VECTOR_INDEX_DIR", "indexes"))
+
+
+@st.cache_resource
+def open_vector_index(path):
+    """Open a memory-mapped IVF index once per process."""
+    return IVFIndex(path)
+
+
+def get_vector_index(model_name):
+    """Open the IVF index for ``model_name``, if one has been built."""
+    # Checked on every run, so an index built after startup is picked up
+    path = VECTOR_INDEX_DIR / model_name
+    if not (path / "meta.json").exists():
+        return None
+    return open_vector_index(path)
+
+
+vector_index = get_vector_index(model_selectbox)
+
+
+@st.cache_resource
+def get_vector_cache(model_name):
+    """Memoise floret vectors for every form looked up with ``model_name``."""
+    # Rows only: the vocab comes from the registry's current pipeline on each call
+    return VectorCache()
+
+
+vector_cache = get_vector_cache(model_selectbox)
+
+# Largest word list accepted by the similarity matrix tab
+MAX_MATRIX_WORDS = 100
+
+tab1, tab2, tab3, tab4 = st.tabs(
+    ["Find Similar Words", "Compare Two Words", "Similarity Matrix", "About"]
+)
 
 with tab1:
-    word = st.text_input("Enter a Latin word:", value="rex", key="sim_word")
+    query = st.text_input(
+        "Enter one or more Latin words (separated by spaces or commas):",
+        value="rex",
+        key="sim_word",
+    )
     n_results = st.slider("Number of results:", min_value=1, max_value=10, value=3)
+    search_in = "DCC core vocabulary"
+    if vector_index is not None:
+        search_in = st.radio(
+            "Search in:",
+            ("DCC core vocabulary", f"Large vocabulary ({len(vector_index):,} forms, approximate)"),
+            horizontal=True,
+        )
+        if vector_index.meta.get("version") != nlp.meta.get("version"):
+            st.warning(
+                f"The large-vocabulary index was built with {model_selectbox} "
+                f"v{vector_index.meta.get('version')}; rebuild it for v{nlp.meta.get('version')}."
+            )
 
     if st.button("Find Similar", key="btn_similar"):
-        token = nlp.vocab[word]
-        if not token.has_vector:
+        words = query.replace(",", " ").split()
+        missing = [word for word in words if not nlp.vocab.has_vector(word)]
+        for word in missing:
             st.error(f"No vector found for '{word}'.")
-        else:
-            word_vec = token.vector
-            word_norm = np.linalg.norm(word_vec)
-            results = []
-            for candidate, cand_vec in candidate_vectors.items():
-                if candidate == word:
-                    continue
-                sim = np.dot(word_vec, cand_vec) / (
-                    word_norm * np.linalg.norm(cand_vec)
-                )
-                results.append((candidate, float(sim)))
-            results.sort(key=lambda x: x[1], reverse=True)
-            results = results[:n_results]
-
-            st.markdown(f"**Top {len(results)} words most similar to *{word}*:**")
-            for i, (w, score) in enumerate(results, 1):
-                st.text(f"{i:3d}. {w:<20s} {score:.4f}")
+        words = [word for word in words if word not in missing]
+        if words:
+            # All queries are scored in one matrix product against the candidates
+            queries = vector_cache.get(nlp.vocab, words)
+            if search_in == "DCC core vocabulary":
+                all_results = candidate_index.search(words, queries, n_results)
+            else:
+                all_results = vector_index.most_similar(words, queries, n_results)
+            for word, results in zip(words, all_results):
+                st.markdown(f"**Top {len(results)} words most similar to *{word}*:**")
+                for i, (w, score) in enumerate(results, 1):
+                    st.text(f"{i:3d}. {w:<20s} {score:.4f}")
 
 with tab2:
     col1, col2 = st.columns(2)
@@ -201,18 +138,15 @@ with tab2:
         word_b = st.text_input("Second word:", value="regina", key="word_b")
 
     if st.button("Compare", key="btn_compare"):
-        doc_a = nlp(word_a)
-        doc_b = nlp(word_b)
-
-        has_a = doc_a[0].has_vector if len(doc_a) > 0 else False
-        has_b = doc_b[0].has_vector if len(doc_b) > 0 else False
+        word_a, word_b = word_a.strip(), word_b.strip()
 
-        if not has_a:
+        if not word_a or not nlp.vocab.has_vector(word_a):
             st.error(f"No vector found for '{word_a}'.")
-        elif not has_b:
+        elif not word_b or not nlp.vocab.has_vector(word_b):
             st.error(f"No vector found for '{word_b}'.")
         else:
-            similarity = doc_a.similarity(doc_b)
+            vec_a, vec_b = vector_cache.get(nlp.vocab, [word_a, word_b])
+            similarity = cosine(vec_a, vec_b)
             st.metric(
                 label=f"Similarity: {word_a} ↔ {word_b}",
                 value=f"{similarity:.4f}",
@@ -225,6 +159,67 @@ with tab2:
                 st.warning("These words are **not very similar**.")
 
 with tab3:
+    matrix_query = st.text_area(
+        "Enter Latin words (separated by spaces, commas, or new lines):",
+        value="rex regina regnum imperator miles bellum pax amor",
+        key="matrix_words",
+    )
+
+    if st.button("Compute Matrix", key="btn_matrix"):
+        # Keep the first occurrence of each word, in input order
+        words = list(dict.fromkeys(matrix_query.replace(",", " ").split()))
+        missing = [word for word in words if not nlp.vocab.has_vector(word)]
+        for word in missing:
+            st.error(f"No vector found for '{word}'.")
+        words = [word for word in words if word not in missing]
+        if len(words) > MAX_MATRIX_WORDS:
+            st.warning(f"Only the first {MAX_MATRIX_WORDS} words are compared.")
+            words = words[:MAX_MATRIX_WORDS]
+
+        if len(words) < 2:
+            st.info("Enter at least two words to compare.")
+        else:
+            # All N x N pairs come from one product of the normalised vectors
+            matrix = pairwise_similarity(vector_cache.get(nlp.vocab, words))
+            df = pd.DataFrame(matrix, index=words, columns=words)
+
+            pairs = df.rename_axis("word_a").reset_index().melt(
+                id_vars="word_a", var_name="word_b", value_name="similarity"
+            )
+            base = alt.Chart(pairs).encode(
+                x=alt.X("word_b:N", sort=words, title=None),
+                y=alt.Y("word_a:N", sort=words, title=None),
+            )
+            heatmap = base.mark_rect().encode(
+                color=alt.Color(
+                    "similarity:Q", scale=alt.Scale(scheme="blues", domain=[0, 1])
+                ),
+                tooltip=["word_a", "word_b", alt.Tooltip("similarity:Q", format=".4f")],
+            )
+            chart = heatmap
+            if len(words) <= 20:
+                labels = base.mark_text(fontSize=10).encode(
+                    text=alt.Text("similarity:Q", format=".2f"),
+                    color=alt.condition(
+                        alt.datum.similarity > 0.6, alt.value("white"), alt.value("black")
+                    ),
+                )
+                chart = heatmap + labels
+            cell_size = max(600 // len(words), 12)
+            st.altair_chart(
+                chart.properties(
+                    width=cell_size * len(words), height=cell_size * len(words)
+                )
+            )
+
+            st.download_button(
+                label="Download CSV",
+                data=df.to_csv(float_format="%.4f"),
+                file_name="similarity_matrix.csv",
+                mime="text/csv",
+            )
+
+with tab4:
     st.markdown("""
     ## About
 
@@ -245,12 +240,24 @@ with tab3:
     - **0.0** = orthogonal (unrelated)
     - **< 0** = opposite (rare in practice)
 
+    ### Similarity Matrix
+
+    "Similarity Matrix" compares every pair in a list of words in one
+    vectorized pass and draws the result as a heatmap. Floret builds the
+    vector of each form from hashed character n-grams; the page memoises
+    those vectors, so repeated forms are only hashed once.
+
     ### Candidate List
 
-    "Find Similar Words" searches against a curated list of ~600 lemmas
+    "Find Similar Words" searches against the ~1,000 lemmas
     from the DCC Core Latin Vocabulary. This is necessary because floret
     vectors use hashing and don't maintain a full vocabulary index.
 
+    To search tens of thousands of attested forms instead, build an
+    approximate nearest-neighbour index offline with
+    `scripts/build_vector_index.py`; the page then offers a
+    "Large vocabulary" option that searches it from a memory-mapped file.
+
     ### Available Models
 
     - **la_core_web_md**: 50,000 hash buckets (smaller, faster)
@@ -1,7 +1,9 @@
 import streamlit as st
-import spacy
 import pandas as pd
 
+from latincy_dashboard.models import get_model
+from latincy_dashboard.workspace import get_workspace, workspace_text
+
 st.set_page_config(page_title="Morphology Demo", layout="wide")
 st.sidebar.header("Morphology Demo")
 
@@ -127,29 +129,20 @@ model_selectbox = st.sidebar.selectbox(
     "Choose model:", ("la_core_web_lg", "la_core_web_md", "la_core_web_sm")
 )
 
-
-@st.cache_resource
-def load_model(model_name):
-    return spacy.load(model_name)
-
-
-nlp = load_model(model_selectbox)
+nlp = get_model(model_selectbox)
+workspace = get_workspace()
 
 tab1, tab2 = st.tabs(["Analyze", "About"])
 
 with tab1:
     text = st.text_area(
-        "Enter Latin text to analyze (max ~200 tokens):", value=default_text, height=200
+        "Enter Latin text to analyze (max ~200 tokens):",
+        value=workspace_text(default_text),
+        height=200,
     )
 
-    if st.button("Analyze Morphology"):
-        tokens = text.split()
-        if len(tokens) > 200:
-            st.warning("Text trimmed to ~200 tokens.")
-            text = " ".join(tokens[:200])
-
-        doc = nlp(text)
-
+    doc = workspace.current_doc(nlp, st.button("Analyze Morphology"), text, max_tokens=200)
+    if doc is not None:
         rows = []
         token_data = []
         for token in doc:
@@ -173,13 +166,6 @@ with tab1:
                 }
             )
 
-        st.session_state["morph_rows"] = rows
-        st.session_state["morph_tokens"] = token_data
-
-    if "morph_rows" in st.session_state:
-        rows = st.session_state["morph_rows"]
-        token_data = st.session_state["morph_tokens"]
-
         df = pd.DataFrame(rows)
         st.dataframe(df, use_container_width=True, hide_index=True)
 
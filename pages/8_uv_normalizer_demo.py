@@ -1,7 +1,34 @@
-import streamlit as st
-from typing import Dict, Any
+import os
+import time
+from collections import Counter
 
-from latincy_uv import UVNormalizerRules, NormalizationResult
+import pandas as pd
+import streamlit as st
+from typing import Dict
+
+from latincy_uv import UVNormalizerRules
+
+from latincy_dashboard.corpus import read_uploads
+from latincy_dashboard.export import write_text_archive
+from latincy_dashboard.uv import (
+    HTML_END,
+    HTML_GREEN,
+    HTML_GREY,
+    HTML_RED,
+    MAX_RENDER_CHARS,
+    CachedNormalizer,
+    NormalizedText,
+    calculate_metrics,
+    colorize_changes,
+    count_metrics,
+    count_rules,
+    metrics_from_counts,
+    normalize_corpus,
+    page_bounds,
+    sum_counts,
+    to_uonly,
+)
+from latincy_dashboard.uv_component import analyze_uv
 
 st.set_page_config(page_title="U/V Normalizer Demo", layout="wide")
 st.sidebar.header("U/V Normalizer Demo")
@@ -11,101 +38,46 @@ SAMPLE_TEXT = """Ita fac, mi Lucili: vindica te tibi, et tempus quod adhuc aut a
 
 SAMPLE_TEXT_UONLY = SAMPLE_TEXT.replace("v", "u").replace("V", "U")
 
-# HTML styling
-HTML_GREEN = '<span style="color: #28a745; font-weight: bold">'
-HTML_RED = '<span style="color: #dc3545; font-weight: bold">'
-HTML_GREY = '<span style="color: #6c757d">'
-HTML_END = "</span>"
-
 
 @st.cache_resource
-def get_normalizer() -> UVNormalizerRules:
-    """Get cached normalizer instance."""
-    return UVNormalizerRules()
-
-
-def to_uonly(text: str) -> str:
-    """Convert text to u-only spelling (all v -> u)."""
-    return text.replace("v", "u").replace("V", "U")
-
-
-def colorize_changes(original: str, normalized: str, reference: str = None) -> str:
-    """Create HTML with color-coded changes."""
-    result = [HTML_GREY]
-
-    for i, (orig, norm) in enumerate(zip(original, normalized)):
-        if orig != norm:
-            if reference and i < len(reference):
-                if norm == reference[i]:
-                    result.append(f"{HTML_END}{HTML_GREEN}{norm}{HTML_END}{HTML_GREY}")
-                else:
-                    result.append(f"{HTML_END}{HTML_RED}{norm}{HTML_END}{HTML_GREY}")
-            else:
-                result.append(f"{HTML_END}{HTML_GREEN}{norm}{HTML_END}{HTML_GREY}")
-        else:
-            result.append(orig)
-
-    result.append(HTML_END)
-    return "".join(result)
-
-
-def calculate_metrics(source: str, normalized: str, reference: str) -> Dict[str, Any]:
-    """Calculate accuracy metrics."""
-    min_len = min(len(source), len(normalized), len(reference))
+def get_normalizer() -> CachedNormalizer:
+    """Get cached normalizer instance, memoising results per word."""
+    return CachedNormalizer(UVNormalizerRules())
 
-    total_uv = 0
-    correct = 0
-    true_positives = 0
-    false_positives = 0
-    false_negatives = 0
-    changes_needed = 0
-    changes_made = 0
 
-    for i in range(min_len):
-        src, norm, ref = source[i], normalized[i], reference[i]
+def show_changes(original: str, normalized: str, reference: str = None, key: str = "changes"):
+    """Render the color-coded text, a page at a time if it is very long."""
+    if len(normalized) <= MAX_RENDER_CHARS:
+        st.markdown(colorize_changes(original, normalized, reference), unsafe_allow_html=True)
+        return
+    bounds = page_bounds(normalized)
+    page = st.number_input(
+        f"Page (of {len(bounds)}):", min_value=1, max_value=len(bounds), value=1, key=key
+    )
+    start, end = bounds[page - 1]
+    st.caption(f"Characters {start + 1:,}-{end:,} of {len(normalized):,}")
+    st.markdown(
+        colorize_changes(original, normalized, reference, start, end),
+        unsafe_allow_html=True,
+    )
 
-        if src.lower() in ("u", "v"):
-            total_uv += 1
 
-            needed = src != ref
-            made = src != norm
+def show_rule_counts(rules: Counter):
+    """Show a table of changes per rule, most frequent first."""
+    total_changes = sum(rules.values())
+    st.dataframe(
+        pd.DataFrame(
+            [
+                {"rule": rule, "changes": n, "share": n / total_changes}
+                for rule, n in rules.most_common()
+            ]
+        ),
+        hide_index=True,
+        column_config={"share": st.column_config.NumberColumn(format="%.3f")},
+    )
 
-            if needed:
-                changes_needed += 1
-            if made:
-                changes_made += 1
 
-            if norm == ref:
-                correct += 1
-                if needed and made:
-                    true_positives += 1
-            else:
-                if not needed and made:
-                    false_positives += 1
-                elif needed and not made:
-                    false_negatives += 1
-
-    accuracy = correct / total_uv if total_uv > 0 else 1.0
-    precision = true_positives / changes_made if changes_made > 0 else 1.0
-    recall = true_positives / changes_needed if changes_needed > 0 else 1.0
-    f1 = 2 * precision * recall / (precision + recall) if (precision + recall) > 0 else 0.0
-
-    return {
-        "total_uv": total_uv,
-        "correct": correct,
-        "accuracy": accuracy,
-        "precision": precision,
-        "recall": recall,
-        "f1": f1,
-        "true_positives": true_positives,
-        "false_positives": false_positives,
-        "false_negatives": false_negatives,
-        "changes_needed": changes_needed,
-        "changes_made": changes_made,
-    }
-
-
-def show_rule_details(result: NormalizationResult):
+def show_rule_details(result: NormalizedText):
     """Show detailed rule application information."""
     if not result.changes:
         st.info("No changes made - text already normalized")
@@ -129,6 +101,36 @@ def show_rule_details(result: NormalizationResult):
                 st.markdown(f"*...and {len(changes) - 10} more*")
 
 
+def evaluate_corpus(texts, progress):
+    """Evaluate every reference text, returning per-file rows, corpus metrics and rule counts."""
+    rows = []
+    all_counts = []
+    rules: Counter = Counter()
+    start = time.perf_counter()
+    for i, (name, reference) in enumerate(texts, 1):
+        source = to_uonly(reference)
+        result = normalizer.normalize_detailed(source)
+        counts = count_metrics(source, result.normalized, reference)
+        all_counts.append(counts)
+        rules.update(count_rules(result.changes))
+        metrics = metrics_from_counts(counts)
+        rows.append(
+            {
+                "file": name,
+                "characters": len(reference),
+                "u/v": metrics["total_uv"],
+                "errors": metrics["total_uv"] - metrics["correct"],
+                "accuracy": metrics["accuracy"],
+                "precision": metrics["precision"],
+                "recall": metrics["recall"],
+                "f1": metrics["f1"],
+            }
+        )
+        progress.progress(i / len(texts), text=f"Evaluated {i} of {len(texts)} files")
+    elapsed = time.perf_counter() - start
+    return rows, metrics_from_counts(sum_counts(all_counts)), rules, elapsed
+
+
 normalizer = get_normalizer()
 
 st.title("Latin U/V Normalizer")
@@ -138,7 +140,9 @@ st.markdown(
     "Converts consonantal 'u' to 'v' and vocalic 'v' to 'u'."
 )
 
-tab1, tab2, tab3 = st.tabs(["Normalize", "Evaluate", "About"])
+tab1, tab_batch, tab_analyze, tab2, tab3, tab4 = st.tabs(
+    ["Normalize", "Batch", "Analyze", "Evaluate", "Evaluate Corpus", "About"]
+)
 
 # === NORMALIZE TAB ===
 with tab1:
@@ -159,22 +163,151 @@ with tab1:
 
     show_details = st.checkbox("Show rule details", value=False)
 
+    # Results are kept in the session so paging through long output survives reruns
     if st.button("Normalize", type="primary"):
         if not text.strip():
             st.warning("Please enter some text")
+            st.session_state.pop("uv_normalized", None)
         else:
-            result = normalizer.normalize_detailed(text)
+            st.session_state["uv_normalized"] = (text, normalizer.normalize_detailed(text))
+
+    if "uv_normalized" in st.session_state:
+        source, result = st.session_state["uv_normalized"]
+
+        with col2:
+            st.markdown("**Normalized text:**")
+            show_changes(source, result.normalized, key="normalize_page")
+
+            n_changes = len(result.changes)
+            st.markdown(f"*{n_changes} change{'s' if n_changes != 1 else ''} made*")
 
-            with col2:
-                st.markdown("**Normalized text:**")
-                colored = colorize_changes(text, result.normalized)
-                st.markdown(colored, unsafe_allow_html=True)
+        if show_details:
+            show_rule_details(result)
 
-                n_changes = len(result.changes)
-                st.markdown(f"*{n_changes} change{'s' if n_changes != 1 else ''} made*")
+    with st.expander("Word cache"):
+        cache_stats = normalizer.stats()
+        st.markdown(f"""
+        - **Cached words:** {cache_stats['size']:,} of {cache_stats['max_size']:,}
+        - **Hits:** {cache_stats['hits']:,} ({cache_stats['hit_rate']:.1%})
+        - **Misses:** {cache_stats['misses']:,}
+        - **Tokens normalized in context:** {cache_stats['uncached']:,}
+        """)
 
-            if show_details:
-                show_rule_details(result)
+# === BATCH TAB ===
+with tab_batch:
+    st.markdown(
+        "Normalize whole u-only editions: upload .txt files or a .zip of .txt "
+        "files. Texts are split into paragraph chunks and normalized in "
+        "parallel, then reassembled in order."
+    )
+
+    batch_files = st.file_uploader(
+        "Upload .txt files or a .zip of .txt files",
+        type=["txt", "zip"],
+        accept_multiple_files=True,
+        key="uv_batch_files",
+    )
+    n_workers = st.number_input(
+        "Processes", min_value=1, max_value=os.cpu_count() or 1, value=1
+    )
+
+    if st.button("Normalize Files", type="primary", disabled=not batch_files):
+        texts = read_uploads(batch_files)
+        if not texts:
+            st.warning("No .txt files found in the upload.")
+        else:
+            progress = st.progress(0.0, text="Normalizing...")
+            start = time.perf_counter()
+            outputs, rules = normalize_corpus(
+                texts,
+                n_workers=int(n_workers),
+                on_chunk=lambda done, total: progress.progress(
+                    done / total, text=f"Normalized {done} of {total} chunks"
+                ),
+            )
+            elapsed = time.perf_counter() - start
+            n_chars = sum(len(text) for _, text in texts)
+            progress.progress(
+                1.0,
+                text=f"Normalized {len(outputs)} files ({n_chars:,} characters) in "
+                f"{elapsed:.1f}s ({n_chars / max(elapsed, 1e-9):,.0f} chars/s)",
+            )
+
+            if len(outputs) == 1:
+                name, normalized, _ = outputs[0]
+                data, file_name, mime = normalized.encode("utf-8"), name, "text/plain"
+            else:
+                spool = write_text_archive((name, normalized) for name, normalized, _ in outputs)
+                data, file_name, mime = spool.read(), "uv_normalized.zip", "application/zip"
+            st.download_button(
+                label="Download normalized text",
+                data=data,
+                file_name=file_name,
+                mime=mime,
+            )
+
+            st.subheader("By File")
+            st.dataframe(
+                pd.DataFrame(
+                    [
+                        {"file": name, "characters": len(normalized), "changes": changes}
+                        for name, normalized, changes in outputs
+                    ]
+                ),
+                hide_index=True,
+            )
+
+            st.subheader("By Rule")
+            if rules:
+                show_rule_counts(rules)
+            else:
+                st.info("No changes made - texts already normalized")
+
+# === ANALYZE TAB ===
+with tab_analyze:
+    st.markdown(
+        "Tag and normalize: the text is analysed by the shared LatinCy "
+        "pipeline (reusing any cached analysis), then the `uv_normalizer` "
+        "component stores each token's normalized form as `token._.uv_norm`."
+    )
+
+    model_name = st.selectbox(
+        "Choose model:", ("la_core_web_lg", "la_core_web_md", "la_core_web_sm")
+    )
+    analyze_text = st.text_area(
+        "Input text (u-only spelling):",
+        value=SAMPLE_TEXT_UONLY,
+        height=150,
+        key="uv_analyze_text",
+    )
+
+    if st.button("Analyze", type="primary"):
+        if not analyze_text.strip():
+            st.warning("Please enter some text")
+            st.session_state.pop("uv_analyzed", None)
+        else:
+            st.session_state["uv_analyzed"] = (model_name, analyze_text)
+
+    if "uv_analyzed" in st.session_state:
+        # Reruns while paging are served from the Doc cache
+        analyzed_model, analyzed_text = st.session_state["uv_analyzed"]
+        doc = analyze_uv(analyzed_model, analyzed_text)
+        show_changes(doc.text, doc._.uv_text, key="analyze_page")
+        st.dataframe(
+            pd.DataFrame(
+                [
+                    {
+                        "form": token.text,
+                        "normalized": token._.uv_norm,
+                        "lemma": token.lemma_,
+                        "upos": token.pos_,
+                    }
+                    for token in doc
+                    if not token.is_space
+                ]
+            ),
+            hide_index=True,
+        )
 
 # === EVALUATE TAB ===
 with tab2:
@@ -194,43 +327,104 @@ with tab2:
     if st.button("Evaluate", type="primary"):
         if not reference.strip():
             st.warning("Please enter reference text")
+            st.session_state.pop("uv_evaluated", None)
         else:
             source = to_uonly(reference)
             normalized = normalizer.normalize(source)
+            st.session_state["uv_evaluated"] = (source, normalized, reference)
 
-            metrics = calculate_metrics(source, normalized, reference)
+    if "uv_evaluated" in st.session_state:
+        source, normalized, evaluated = st.session_state["uv_evaluated"]
+        metrics = calculate_metrics(source, normalized, evaluated)
 
-            st.subheader("Evaluation Results")
-            colored = colorize_changes(source, normalized, reference)
-            st.markdown(colored, unsafe_allow_html=True)
+        st.subheader("Evaluation Results")
+        show_changes(source, normalized, evaluated, key="evaluate_page")
 
-            st.markdown(
-                f"**Legend:** {HTML_GREEN}Correct{HTML_END} &middot; "
-                f"{HTML_RED}Incorrect{HTML_END} &middot; "
-                f"{HTML_GREY}Unchanged{HTML_END}",
-                unsafe_allow_html=True,
+        st.markdown(
+            f"**Legend:** {HTML_GREEN}Correct{HTML_END} &middot; "
+            f"{HTML_RED}Incorrect{HTML_END} &middot; "
+            f"{HTML_GREY}Unchanged{HTML_END}",
+            unsafe_allow_html=True,
+        )
+
+        st.subheader("Metrics")
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Accuracy", f"{metrics['accuracy']:.1%}")
+        col2.metric("Precision", f"{metrics['precision']:.1%}")
+        col3.metric("Recall", f"{metrics['recall']:.1%}")
+        col4.metric("F1 Score", f"{metrics['f1']:.1%}")
+
+        with st.expander("Detailed Statistics"):
+            st.markdown(f"""
+            - **Total U/V characters:** {metrics['total_uv']}
+            - **Correct:** {metrics['correct']}
+            - **Changes needed:** {metrics['changes_needed']}
+            - **Changes made:** {metrics['changes_made']}
+            - **True positives:** {metrics['true_positives']}
+            - **False positives:** {metrics['false_positives']}
+            - **False negatives:** {metrics['false_negatives']}
+            """)
+
+# === EVALUATE CORPUS TAB ===
+with tab3:
+    st.markdown(
+        "Upload correctly normalized reference texts (.txt files or a .zip of "
+        ".txt files). Each file is converted to u-only form, normalized, and "
+        "scored against the original."
+    )
+
+    reference_files = st.file_uploader(
+        "Upload .txt files or a .zip of .txt files",
+        type=["txt", "zip"],
+        accept_multiple_files=True,
+        key="uv_reference_files",
+    )
+
+    if st.button("Evaluate Corpus", type="primary", disabled=not reference_files):
+        texts = read_uploads(reference_files)
+        if not texts:
+            st.warning("No .txt files found in the upload.")
+        else:
+            progress = st.progress(0.0, text="Evaluating...")
+            rows, metrics, rules, elapsed = evaluate_corpus(texts, progress)
+            n_chars = sum(row["characters"] for row in rows)
+            progress.progress(
+                1.0,
+                text=f"Evaluated {len(rows)} files ({n_chars:,} characters) in {elapsed:.1f}s",
             )
 
-            st.subheader("Metrics")
+            st.subheader("Corpus Metrics")
             col1, col2, col3, col4 = st.columns(4)
             col1.metric("Accuracy", f"{metrics['accuracy']:.1%}")
             col2.metric("Precision", f"{metrics['precision']:.1%}")
             col3.metric("Recall", f"{metrics['recall']:.1%}")
             col4.metric("F1 Score", f"{metrics['f1']:.1%}")
+            st.caption(
+                f"{metrics['total_uv']:,} u/v characters, "
+                f"{metrics['changes_needed']:,} changes needed, "
+                f"{metrics['changes_made']:,} made, "
+                f"{metrics['false_positives']:,} false positives, "
+                f"{metrics['false_negatives']:,} false negatives"
+            )
 
-            with st.expander("Detailed Statistics"):
-                st.markdown(f"""
-                - **Total U/V characters:** {metrics['total_uv']}
-                - **Correct:** {metrics['correct']}
-                - **Changes needed:** {metrics['changes_needed']}
-                - **Changes made:** {metrics['changes_made']}
-                - **True positives:** {metrics['true_positives']}
-                - **False positives:** {metrics['false_positives']}
-                - **False negatives:** {metrics['false_negatives']}
-                """)
+            st.subheader("By File")
+            st.dataframe(
+                pd.DataFrame(rows),
+                hide_index=True,
+                column_config={
+                    col: st.column_config.NumberColumn(format="%.3f")
+                    for col in ("accuracy", "precision", "recall", "f1")
+                },
+            )
+
+            st.subheader("By Rule")
+            if rules:
+                show_rule_counts(rules)
+            else:
+                st.info("No changes made - texts already normalized")
 
 # === ABOUT TAB ===
-with tab3:
+with tab4:
     st.markdown("""
     ## About
 
@@ -254,6 +448,21 @@ with tab3:
     9. **Word-final**: -> `u` (*tu*, *cum*)
     10. **Post-consonant**: Before vowel -> `v` (*silva*, *servo*)
 
+    ### Word Cache
+
+    The rules look only within a word, so each distinct word is normalized
+    once and its result (with the rules applied) is reused for every later
+    occurrence. Tokens whose letters are joined by hyphens, apostrophes or
+    digits are always normalized in full.
+
+    ### Pipeline Component
+
+    Importing `latincy_dashboard.uv_component` registers a `uv_normalizer`
+    spaCy factory, so normalization can run inside any LatinCy pipeline
+    (including `nlp.pipe`) with `nlp.add_pipe("uv_normalizer")`. Each token's
+    normalized form is stored as `token._.uv_norm` (and, with
+    `config={"set_norm": True}`, as `token.norm_`); `doc._.uv_text` joins them.
+
     ### Accuracy
 
     - **Curated test set (100 sentences):** 100%
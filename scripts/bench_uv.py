@@ -0,0 +1,66 @@
+"""Benchmark parallel batch U/V normalization.
+
+Normalizes a corpus with 1, 2, 4, ... worker processes and reports
+characters per second, the speedup over one worker, and whether the
+output matches the single-process run.
+
+    python scripts/bench_uv.py texts/*.txt --workers 1 2 4 8
+
+Without files, a u-only sample paragraph repeated ``--paragraphs`` times
+is used.
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from latincy_dashboard.uv import CHUNK_CHARS, normalize_corpus, to_uonly  # noqa: E402
+
+# Seneca, Epistulae Morales 1
+SAMPLE_PARAGRAPH = to_uonly(
+    "Ita fac, mi Lucili: vindica te tibi, et tempus quod adhuc aut auferebatur aut "
+    "subripiebatur aut excidebat collige et serva. Persuade tibi hoc sic esse ut "
+    "scribo: quaedam tempora eripiuntur nobis, quaedam subducuntur, quaedam effluunt."
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("files", nargs="*", type=Path)
+    parser.add_argument("--paragraphs", type=int, default=20_000)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[n for n in (1, 2, 4, 8, 16) if n <= (os.cpu_count() or 1)],
+    )
+    parser.add_argument("--chunk-chars", type=int, default=CHUNK_CHARS)
+    args = parser.parse_args()
+
+    if args.files:
+        texts = [(path.name, path.read_text(encoding="utf-8")) for path in args.files]
+    else:
+        texts = [("sample.txt", "\n\n".join([SAMPLE_PARAGRAPH] * args.paragraphs))]
+    n_chars = sum(len(text) for _, text in texts)
+
+    print(f"{len(texts)} file(s), {n_chars:,} characters, {args.chunk_chars:,} chars/chunk\n")
+    print(f"{'workers':>7}  {'seconds':>8}  {'chars/s':>12}  {'speedup':>7}  {'same':>5}")
+    reference = baseline = None
+    for n_workers in args.workers:
+        start = time.perf_counter()
+        outputs, _ = normalize_corpus(texts, n_workers=n_workers, chunk_chars=args.chunk_chars)
+        elapsed = time.perf_counter() - start
+        if reference is None:
+            reference, baseline = outputs, elapsed
+        print(
+            f"{n_workers:>7}  {elapsed:>8.2f}  {n_chars / elapsed:>12,.0f}  "
+            f"{baseline / elapsed:>7.2f}  {str(outputs == reference):>5}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Benchmark compact candidate vector storage for the similarity page.
+
+Builds the DCC candidate index as float32, float16 and int8 and reports
+memory, query latency and agreement of the top-k rankings with float32.
+
+    python scripts/bench_vectors.py --model la_core_web_lg
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import spacy
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from latincy_dashboard.dcc import load_core_lemmas  # noqa: E402
+from latincy_dashboard.vectors import VECTOR_DTYPES, build_candidate_index  # noqa: E402
+
+# The sort of single-word queries the page serves
+QUERIES = [
+    "rex", "regina", "bellum", "amor", "urbs", "deus", "miles", "mare",
+    "uirtus", "consul", "amicus", "gladius", "terra", "caelum", "pater", "puella",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--model", default="la_core_web_lg")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    nlp = spacy.load(args.model, exclude=["ner", "parser", "senter"])
+    candidates = load_core_lemmas()
+    queries = np.vstack([nlp.vocab[word].vector for word in QUERIES])
+
+    reference = None
+    print(f"{len(candidates)} candidates, {len(QUERIES)} queries, top-{args.k}\n")
+    print(f"{'dtype':>8}  {'KB':>8}  {'ms/query':>9}  {'top-1':>6}  {'overlap@k':>9}")
+    for dtype in VECTOR_DTYPES:
+        index = build_candidate_index(nlp.vocab, candidates, dtype=dtype)
+        results = index.search(QUERIES, queries, args.k)
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            # One query at a time, as the page serves them
+            for word, query in zip(QUERIES, queries):
+                index.search([word], query, args.k)
+        ms = (time.perf_counter() - start) * 1000 / (args.repeat * len(QUERIES))
+        if reference is None:
+            reference = results
+        top1 = np.mean([r[0][0] == o[0][0] for r, o in zip(reference, results)])
+        overlap = np.mean(
+            [
+                len({w for w, _ in r} & {w for w, _ in o}) / args.k
+                for r, o in zip(reference, results)
+            ]
+        )
+        print(f"{dtype:>8}  {index.nbytes / 1024:>8.0f}  {ms:>9.3f}  {top1:>6.2f}  {overlap:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
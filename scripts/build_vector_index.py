@@ -0,0 +1,91 @@
+"""Build the large-vocabulary similarity index for a LatinCy model.
+
+Computes floret vectors for a word list (and/or every attested form in a
+corpus), writes a memory-mapped IVF index that the similarity page picks up,
+and prints a recall-vs-latency report against exact search.
+
+    python scripts/build_vector_index.py --model la_core_web_lg \\
+        --corpus texts/*.txt --words lemmas.txt --out indexes
+
+The index is written to ``<out>/<model>``; point ``LATINCY_VECTOR_INDEX_DIR``
+at ``<out>`` if it is not the default ``indexes`` directory.
+"""
+
+import argparse
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+import spacy
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from latincy_dashboard.ann import IVFIndex, build_ivf_index, recall_report  # noqa: E402
+from latincy_dashboard.models import model_pipe_names  # noqa: E402
+
+WORD = re.compile(r"[^\W\d_]+")
+
+
+def read_words(args):
+    """Collect the vocabulary to index from word lists and corpus files."""
+    counts = Counter()
+    for path in args.corpus:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                counts.update(w.lower() for w in WORD.findall(line))
+    words = {w for w, n in counts.items() if n >= args.min_count}
+    for path in args.words:
+        with open(path, encoding="utf-8") as f:
+            words.update(line.strip() for line in f if line.strip())
+    return sorted(words)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--model", default="la_core_web_lg")
+    parser.add_argument("--words", nargs="*", default=[], help="Word lists, one word per line")
+    parser.add_argument("--corpus", nargs="*", default=[], help="Plain-text files to harvest forms from")
+    parser.add_argument("--min-count", type=int, default=2, help="Minimum corpus frequency of a form")
+    parser.add_argument("--out", default="indexes")
+    parser.add_argument("--lists", type=int, default=None, help="IVF lists (default: sqrt of vocabulary)")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=200, help="Queries sampled for the report")
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    words = read_words(args)
+    if not words:
+        parser.error("no words to index; pass --words and/or --corpus")
+
+    # Only the vocab and its vectors are needed
+    nlp = spacy.load(args.model, exclude=model_pipe_names(args.model))
+    start = time.perf_counter()
+    vectors = np.vstack(
+        [
+            np.asarray(nlp.vocab.vectors.get_batch(words[i : i + args.batch_size]), dtype=np.float32)
+            for i in range(0, len(words), args.batch_size)
+        ]
+    )
+    print(f"Computed {len(words):,} vectors in {time.perf_counter() - start:.1f}s")
+
+    path = Path(args.out) / args.model
+    start = time.perf_counter()
+    meta = {"model": args.model, "version": nlp.meta.get("version", "")}
+    build_ivf_index(path, words, vectors, n_lists=args.lists, meta=meta)
+    print(f"Wrote index to {path} in {time.perf_counter() - start:.1f}s")
+
+    index = IVFIndex(path)
+    rng = np.random.default_rng(0)
+    sample = rng.choice(len(index), min(args.queries, len(index)), replace=False)
+    queries = np.asarray(index.vectors[np.sort(sample)])
+    print(f"\nRecall@{args.k} vs. exact search ({len(queries)} queries, {len(index.centroids)} lists)")
+    print(f"{'n_probe':>8}  {'recall':>7}  {'ms/query':>9}")
+    for row in recall_report(index, queries, k=args.k):
+        print(f"{row['n_probe']:>8}  {row['recall']:>7.3f}  {row['ms_per_query']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
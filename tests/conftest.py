@@ -0,0 +1,49 @@
+import re
+from typing import List, NamedTuple
+
+import pytest
+
+from latincy_dashboard.uv import CONTEXT_CHARS
+
+
+class Change(NamedTuple):
+    position: int
+    original: str
+    normalized: str
+    rule: str
+    context: str
+
+
+class Result(NamedTuple):
+    original: str
+    normalized: str
+    changes: List[Change]
+
+
+class FakeNormalizer:
+    """A word-local stand-in for latincy-uv's rules: u before a vowel becomes v."""
+
+    RULE = re.compile(r"(?<![qg])([uU])(?=[aeiou])")
+
+    def __init__(self):
+        self.calls = 0
+
+    def normalize_detailed(self, text):
+        self.calls += 1
+        changes = []
+        for match in self.RULE.finditer(text):
+            position = match.start()
+            original = match.group(1)
+            normalized = "v" if original == "u" else "V"
+            rule = "initial" if position == 0 or not text[position - 1].isalpha() else "medial"
+            context = text[max(0, position - CONTEXT_CHARS) : position + CONTEXT_CHARS + 1]
+            changes.append(Change(position, original, normalized, rule, context))
+        normalized = list(text)
+        for change in changes:
+            normalized[change.position] = change.normalized
+        return Result(text, "".join(normalized), changes)
+
+
+@pytest.fixture
+def fake_normalizer():
+    return FakeNormalizer()
@@ -0,0 +1,59 @@
+"""Tests for the IVF index behind large-vocabulary similarity search."""
+
+import numpy as np
+import pytest
+
+from latincy_dashboard.ann import IVFIndex, build_ivf_index, recall_report, spherical_kmeans
+from latincy_dashboard.vectors import normalize_rows
+
+N_LISTS = 8
+
+
+@pytest.fixture(scope="module")
+def vectors():
+    return np.random.default_rng(0).normal(size=(500, 16)).astype(np.float32)
+
+
+@pytest.fixture(scope="module")
+def index(tmp_path_factory, vectors):
+    path = tmp_path_factory.mktemp("index")
+    words = [f"w{i}" for i in range(len(vectors))]
+    build_ivf_index(path, words, vectors, n_lists=N_LISTS, meta={"model": "test"})
+    return IVFIndex(path)
+
+
+def test_spherical_kmeans(vectors):
+    centroids = spherical_kmeans(normalize_rows(vectors), N_LISTS)
+    assert centroids.shape == (N_LISTS, vectors.shape[1])
+    np.testing.assert_allclose(np.linalg.norm(centroids, axis=1), 1.0, rtol=1e-5)
+
+
+def test_index_layout(index, vectors):
+    assert len(index) == len(vectors)
+    assert index.meta == {"model": "test", "n_words": len(vectors), "n_lists": N_LISTS}
+    assert index.offsets[0] == 0 and index.offsets[-1] == len(vectors)
+    # Every stored row is the unit vector of the word it is listed under
+    rows = [int(word[1:]) for word in index.words]
+    np.testing.assert_allclose(index.vectors, normalize_rows(vectors)[rows], rtol=1e-5)
+
+
+def test_probing_every_list_is_exact(index, vectors):
+    queries = vectors[:20] + 0.1
+    approx = index.search(queries, k=10, n_probe=N_LISTS)
+    exact = index.exact_search(queries, k=10)
+    for got, expected in zip(approx, exact):
+        assert [row for row, _ in got] == [row for row, _ in expected]
+        np.testing.assert_allclose([s for _, s in got], [s for _, s in expected], rtol=1e-5)
+
+
+def test_recall_report(index, vectors):
+    report = recall_report(index, vectors[:20], k=5, n_probes=(1, N_LISTS, 2 * N_LISTS))
+    assert [row["n_probe"] for row in report] == ["exact", 1, N_LISTS]
+    assert report[-1]["recall"] == 1.0
+    assert 0.0 < report[1]["recall"] <= 1.0
+
+
+def test_most_similar_skips_query_word(index, vectors):
+    (hits,) = index.most_similar(["w3"], vectors[3], n_results=5, n_probe=N_LISTS)
+    assert len(hits) == 5
+    assert "w3" not in [word for word, _ in hits]
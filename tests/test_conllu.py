@@ -0,0 +1,70 @@
+"""Tests for the parsing demo's tabular view of a Doc."""
+
+import pytest
+import spacy
+from spacy.tokens import Doc
+
+from latincy_dashboard.conllu import COLUMNS, doc_to_columns
+
+
+@pytest.fixture(scope="module")
+def vocab():
+    return spacy.blank("la").vocab
+
+
+def rows(doc, max_tokens=None):
+    columns = doc_to_columns(doc, max_tokens=max_tokens)
+    return list(zip(*(columns[col].tolist() for col in COLUMNS)))
+
+
+@pytest.fixture
+def two_sentences(vocab):
+    # Arcs 0->2 and 1->3 cross, and the PER entity runs over the sentence break
+    return Doc(
+        vocab,
+        words=["Caesar", "Gallos", "vicit", "Labienus", ".", "Roma", "gaudet"],
+        heads=[2, 3, 2, 2, 2, 6, 6],
+        deps=["nsubj", "obj", "ROOT", "obl", "punct", "nsubj", "ROOT"],
+        pos=["PROPN", "PROPN", "VERB", "PROPN", "PUNCT", "PROPN", "VERB"],
+        tags=["n", "n", "v", "n", "u", "n", "v"],
+        lemmas=["Caesar", "Gallus", "vinco", "Labienus", ".", "Roma", "gaudeo"],
+        morphs=["Case=Nom|Number=Sing", "Case=Acc", "Tense=Past", "", "", "Case=Nom", ""],
+        ents=["B-PER", "O", "O", "B-PER", "I-PER", "I-PER", "O"],
+    )
+
+
+def test_empty_doc(vocab):
+    assert rows(Doc(vocab, words=[])) == []
+
+
+def test_single_token(vocab):
+    doc = Doc(
+        vocab,
+        words=["Roma"],
+        heads=[0],
+        deps=["ROOT"],
+        pos=["PROPN"],
+        lemmas=["Roma"],
+        morphs=["Case=Nom|Number=Sing"],
+        ents=["B-LOC"],
+    )
+    assert rows(doc) == [
+        ("s1", 1, "Roma", "Roma", "PROPN", "", "Case=Nom, Number=Sing", 0, "ROOT", "LOC")
+    ]
+
+
+def test_non_projective_heads_and_entities_across_sentences(two_sentences):
+    assert rows(two_sentences) == [
+        ("s1", 1, "Caesar", "Caesar", "PROPN", "n", "Case=Nom, Number=Sing", 3, "nsubj", "PER"),
+        ("s1", 2, "Gallos", "Gallus", "PROPN", "n", "Case=Acc", 4, "obj", ""),
+        ("s1", 3, "vicit", "vinco", "VERB", "v", "Tense=Past", 0, "ROOT", ""),
+        ("s1", 4, "Labienus", "Labienus", "PROPN", "n", "", 3, "obl", "PER"),
+        ("s1", 5, ".", ".", "PUNCT", "u", "", 3, "punct", "PER"),
+        ("s2", 1, "Roma", "Roma", "PROPN", "n", "Case=Nom", 2, "nsubj", "PER"),
+        ("s2", 2, "gaudet", "gaudeo", "VERB", "v", "", 0, "ROOT", ""),
+    ]
+
+
+@pytest.mark.parametrize("max_tokens", [0, 1, 5, 6, 7, 500])
+def test_max_tokens_cuts_rows(two_sentences, max_tokens):
+    assert rows(two_sentences, max_tokens) == rows(two_sentences)[:max_tokens]
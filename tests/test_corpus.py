@@ -0,0 +1,67 @@
+"""Tests for the parsing demo's corpus batch mode."""
+
+import pytest
+import spacy
+
+from latincy_dashboard.corpus import iter_paragraphs, pipe_paragraphs
+from latincy_dashboard.export import write_export
+
+TEXTS = [
+    ("a.txt", "Gallia est omnis divisa in partes tres.\n\nQuarum unam incolunt Belgae."),
+    ("b.txt", "Arma virumque cano.\n \nTroiae qui primus ab oris.\n\n\nItaliam fato profugus."),
+    ("c.txt", ""),
+]
+
+
+@pytest.fixture(scope="module")
+def model_path(tmp_path_factory):
+    # Workers load the pipeline by name or path, like an installed model
+    nlp = spacy.blank("la")
+    nlp.add_pipe("sentencizer")
+    path = tmp_path_factory.mktemp("pipeline")
+    nlp.to_disk(path)
+    return str(path)
+
+
+@pytest.fixture(scope="module")
+def nlp(model_path):
+    return spacy.load(model_path)
+
+
+def parsed(items):
+    return [([token.text for token in doc], name, par_idx) for doc, name, par_idx in items]
+
+
+def test_iter_paragraphs():
+    assert [meta for _, meta in iter_paragraphs(TEXTS)] == [
+        ("a.txt", 0),
+        ("a.txt", 1),
+        ("b.txt", 0),
+        ("b.txt", 1),
+        ("b.txt", 2),
+    ]
+
+
+def test_workers_match_serial_run(nlp, model_path):
+    paragraphs = list(iter_paragraphs(TEXTS))
+    serial = parsed(pipe_paragraphs(nlp, model_path, paragraphs, batch_size=2))
+    spawned = parsed(pipe_paragraphs(nlp, model_path, paragraphs, batch_size=2, n_process=2))
+    assert spawned == serial
+    assert [tokens[0] for tokens, _, _ in serial] == [
+        "Gallia",
+        "Quarum",
+        "Arma",
+        "Troiae",
+        "Italiam",
+    ]
+
+
+@pytest.mark.parametrize("n_process", [1, 2])
+def test_export_from_workers(nlp, model_path, n_process):
+    paragraphs = list(iter_paragraphs(TEXTS))
+    items = pipe_paragraphs(nlp, model_path, paragraphs, batch_size=2, n_process=n_process)
+    with write_export(items, "CoNLL-U") as spool:
+        lines = spool.read().decode("utf-8").splitlines()
+    assert lines[:3] == ["# newdoc id = a.txt", "# newpar", "# sent_id = a.txt-p1-s1"]
+    assert lines.count("# newpar") == 5
+    assert "# sent_id = b.txt-p3-s1" in lines
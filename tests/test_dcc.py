@@ -0,0 +1,100 @@
+"""Tests for the DCC core vocabulary component."""
+
+import numpy as np
+import pytest
+import spacy
+from spacy.strings import get_string_id
+from spacy.tokens import Doc
+
+from latincy_dashboard.dcc import DCCCoreMerger, core_lemma_ids, load_core_lemmas
+
+CORE = ["sum", "uenio", "uideo", "et"]
+
+
+@pytest.fixture(scope="module")
+def vocab():
+    return spacy.blank("la").vocab
+
+
+@pytest.fixture
+def merger(vocab):
+    merger = DCCCoreMerger(vocab)
+    merger.core_ids = np.array(sorted(get_string_id(lemma) for lemma in CORE), dtype=np.uint64)
+    return merger
+
+
+def make_doc(vocab, pairs):
+    words, lemmas = zip(*pairs)
+    spaces = [word not in ",." for word in words[1:]] + [False]
+    return Doc(vocab, words=list(words), spaces=spaces, lemmas=list(lemmas))
+
+
+def test_load_core_lemmas():
+    lemmas = load_core_lemmas()
+    assert lemmas[:3] == ("ab", "abeo", "absum")
+    assert len(lemmas) == len(set(lemmas)) > 900
+    # The list is in lower-case u-only spelling, without its comment lines
+    assert all(lemma == lemma.lower() and "v" not in lemma for lemma in lemmas)
+    assert not any(lemma.startswith("#") for lemma in lemmas)
+    ids = core_lemma_ids()
+    assert ids.dtype == np.uint64 and len(ids) == len(lemmas)
+    assert (np.sort(ids) == ids).all()
+
+
+def test_matches_normalized_lemmas(vocab, merger):
+    doc = make_doc(
+        vocab,
+        [
+            ("Veni", "Venio"),
+            (",", ","),
+            ("vidi", "video"),
+            (",", ","),
+            ("vici", "vinco"),
+            (".", "."),
+        ],
+    )
+    doc = merger(doc)
+    assert [token._.is_dcc_core for token in doc] == [True, False, True, False, False, False]
+    assert [(span.text, span.label_) for span in doc.spans["dcc_core"]] == [
+        ("Veni", "CORE"),
+        ("vidi", "CORE"),
+    ]
+    # Tokens keep their spelling and lemma as written
+    assert doc[0].lemma_ == "Venio"
+
+
+def test_coverage(vocab, merger):
+    doc = make_doc(
+        vocab,
+        [
+            ("Gallia", "Gallia"),
+            ("est", "sum"),
+            ("Gallia", "Gallia"),
+            ("et", "et"),
+            ("Gallia", "Gallia"),
+            ("Belgae", "Belgae"),
+            ("sunt", "sum"),
+            (".", "."),
+        ],
+    )
+    assert merger.coverage(doc, top_n=1) == {
+        "words": 7,
+        "core_words": 3,
+        "coverage": 3 / 7,
+        "lemmas": 4,
+        "core_lemmas": 2,
+        # Lemmas are reported in the list's spelling
+        "top_non_core": [("gallia", 3)],
+    }
+    assert merger.coverage(doc)["top_non_core"] == [("gallia", 3), ("belgae", 1)]
+
+
+def test_coverage_of_empty_doc(vocab, merger):
+    assert merger.coverage(Doc(vocab, words=[])) == {
+        "words": 0,
+        "core_words": 0,
+        "coverage": 0.0,
+        "lemmas": 0,
+        "core_lemmas": 0,
+        "top_non_core": [],
+    }
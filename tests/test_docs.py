@@ -0,0 +1,137 @@
+"""Tests for the shared Doc cache and its persistent store."""
+
+import pytest
+import spacy
+from spacy.language import Language
+
+from latincy_dashboard import store as store_module
+from latincy_dashboard.docs import DocCache, doc_key
+from latincy_dashboard.store import DocStore
+
+TEXT = "Gallia est omnis divisa in partes tres."
+
+runs = []
+
+
+@Language.component("test_count_runs")
+def count_runs(doc):
+    runs.append(doc.text)
+    return doc
+
+
+def make_nlp(version="1.0.0"):
+    nlp = spacy.blank("la")
+    nlp.add_pipe("test_count_runs")
+    nlp.meta["name"] = "test_model"
+    nlp.meta["version"] = version
+    return nlp
+
+
+@pytest.fixture(autouse=True)
+def clear_runs():
+    runs.clear()
+
+
+def test_cache_is_bounded_by_bytes():
+    cache = DocCache(max_bytes=10)
+    cache.put(("m", "1", "c", "a"), b"aaaa")
+    cache.put(("m", "1", "c", "b"), b"bbbb")
+    assert cache.get(("m", "1", "c", "a")) == b"aaaa"
+    cache.put(("m", "1", "c", "c"), b"cccc")
+    # b was least recently used
+    assert cache.get(("m", "1", "c", "b")) is None
+    assert cache.bytes == 8
+    # An entry larger than the whole budget is not cached
+    cache.put(("m", "1", "c", "d"), b"d" * 11)
+    assert cache.get(("m", "1", "c", "d")) is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_doc_key():
+    nlp = make_nlp()
+    key = doc_key(nlp, TEXT)
+    assert key[:2] == ("la_test_model", "1.0.0")
+    assert doc_key(nlp, TEXT) == key
+    assert doc_key(nlp, TEXT + " ") != key
+    assert doc_key(make_nlp(), TEXT) == key
+    assert doc_key(make_nlp("1.0.1"), TEXT)[1] == "1.0.1"
+    # Another component changes the pipeline fingerprint
+    other = make_nlp()
+    other.add_pipe("sentencizer")
+    assert doc_key(other, TEXT)[2] != key[2]
+
+
+def test_analyze_runs_the_pipeline_once():
+    nlp = make_nlp()
+    cache = DocCache(max_bytes=1 << 20)
+    doc = cache.analyze(nlp, TEXT)
+    again = cache.analyze(nlp, TEXT)
+    assert runs == [TEXT]
+    assert [token.text for token in again] == [token.text for token in doc]
+    assert cache.stats()["hits"] == 1
+
+
+def test_analyze_many():
+    nlp = make_nlp()
+    cache = DocCache(max_bytes=1 << 20)
+    cache.analyze(nlp, "Arma uirumque cano.")
+    data, n_analysed = cache.analyze_many(nlp, ["Arma uirumque cano.", TEXT, ""])
+    assert n_analysed == 2
+    assert runs == ["Arma uirumque cano.", TEXT, ""]
+    assert len(data) == 3
+
+
+@pytest.fixture
+def doc_store(tmp_path):
+    return DocStore(str(tmp_path / "docs.sqlite"), max_bytes=1 << 20, ttl_seconds=3600)
+
+
+def test_store_survives_a_new_cache(doc_store):
+    nlp = make_nlp()
+    DocCache(max_bytes=1 << 20, store=doc_store).analyze(nlp, TEXT)
+    # A fresh in-memory cache, as after a restart, reads the Doc back from the store
+    doc = DocCache(max_bytes=1 << 20, store=doc_store).analyze(nlp, TEXT)
+    assert runs == [TEXT]
+    assert doc.text == TEXT
+    assert doc_store.stats()["hits"] == 1
+
+
+def test_store_drops_older_versions(doc_store):
+    DocCache(max_bytes=1 << 20, store=doc_store).analyze(make_nlp("1.0.0"), TEXT)
+    DocCache(max_bytes=1 << 20, store=doc_store).analyze(make_nlp("1.0.1"), TEXT)
+    assert runs == [TEXT, TEXT]
+    stats = doc_store.stats()
+    assert stats["entries"] == 1
+    # The 1.0.0 row is gone, so going back re-runs the pipeline
+    DocCache(max_bytes=1 << 20, store=doc_store).analyze(make_nlp("1.0.0"), TEXT)
+    assert len(runs) == 3
+
+
+def test_store_ttl(doc_store, monkeypatch):
+    now = 1_000_000.0
+    monkeypatch.setattr(store_module.time, "time", lambda: now)
+    doc_store.put("a", "m", "1", b"data")
+    assert doc_store.get("a") == b"data"
+    now += 3601
+    assert doc_store.get("a") is None
+    # Expired rows are deleted on the next write
+    doc_store.put("b", "m", "1", b"data")
+    assert doc_store.stats()["entries"] == 1
+
+
+def test_store_is_bounded_by_bytes(tmp_path, monkeypatch):
+    now = 1_000_000.0
+    monkeypatch.setattr(store_module.time, "time", lambda: now)
+    doc_store = DocStore(str(tmp_path / "docs.sqlite"), max_bytes=10, ttl_seconds=3600)
+    doc_store.put("a", "m", "1", b"aaaa")
+    now += 1
+    doc_store.put("b", "m", "1", b"bbbb")
+    now += 1
+    assert doc_store.get("a") == b"aaaa"
+    now += 1
+    doc_store.put("c", "m", "1", b"cccc")
+    # b was least recently accessed
+    assert doc_store.get("b") is None
+    assert doc_store.stats()["bytes"] == 8
+    doc_store.put("d", "m", "1", b"d" * 11)
+    assert doc_store.get("d") is None
@@ -0,0 +1,106 @@
+"""Tests for the parsing demo's exports."""
+
+import io
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+import spacy
+from spacy.tokens import Doc, DocBin
+
+from latincy_dashboard.conllu import COLUMNS
+from latincy_dashboard.export import EXPORT_FORMATS, spool_lines, write_export
+
+
+@pytest.fixture(scope="module")
+def nlp():
+    return spacy.blank("la")
+
+
+@pytest.fixture
+def items(nlp):
+    first = Doc(
+        nlp.vocab,
+        words=["Gallia", "est", "divisa", ".", "Quarum", "unam", "."],
+        sent_starts=[True, False, False, False, True, False, False],
+        ents=["B-LOC", "O", "O", "O", "O", "O", "O"],
+    )
+    second = Doc(nlp.vocab, words=["Arma", "cano"], sent_starts=[True, False])
+    return [(first, "a.txt", 0), (second, "a.txt", 1)]
+
+
+def read(spool):
+    with spool:
+        return spool.read()
+
+
+def test_spool_lines():
+    # Past max_size the spool rolls over to a file on disk
+    spool = spool_lines(["a", "ü", ""], max_size=2)
+    assert read(spool) == "a\nü\n\n".encode("utf-8")
+
+
+def test_spool_lines_empty():
+    assert read(spool_lines([])) == b""
+
+
+def test_tsv(items):
+    lines = read(write_export(items, "TSV")).decode("utf-8").splitlines()
+    assert lines[0].split("\t") == COLUMNS
+    # One header, then one row per token with prefixed sentence ids
+    assert len(lines) == 1 + 9
+    assert lines[1].split("\t")[:3] == ["a.txt-p1-s1", "1", "Gallia"]
+    assert lines[-1].split("\t")[:3] == ["a.txt-p2-s1", "2", "cano"]
+
+
+def test_conllu(items):
+    lines = read(write_export(items, "CoNLL-U")).decode("utf-8").splitlines()
+    assert lines[:4] == [
+        "# newdoc id = a.txt",
+        "# newpar",
+        "# sent_id = a.txt-p1-s1",
+        "# text = Gallia est divisa .",
+    ]
+    assert lines.count("# newdoc id = a.txt") == 1
+    assert lines.count("# newpar") == 2
+    assert [line for line in lines if line.startswith("# sent_id")] == [
+        "# sent_id = a.txt-p1-s1",
+        "# sent_id = a.txt-p1-s2",
+        "# sent_id = a.txt-p2-s1",
+    ]
+    assert all(len(line.split("\t")) == 10 for line in lines if line and not line.startswith("#"))
+
+
+def test_parquet(items):
+    df = pd.read_parquet(io.BytesIO(read(write_export(items, "Parquet"))))
+    assert list(df.columns) == COLUMNS
+    assert df["form"].tolist() == [doc[i].text for doc, _, _ in items for i in range(len(doc))]
+    assert df["sent_id"].iloc[-1] == "a.txt-p2-s1"
+    assert isinstance(df["ent_type"].dtype, pd.CategoricalDtype)
+
+
+def test_arrow(items):
+    table = pa.ipc.open_stream(read(write_export(items, "Arrow"))).read_all()
+    assert table.column_names == COLUMNS
+    assert table.num_rows == 9
+    assert pa.types.is_dictionary(table.schema.field("upos").type)
+
+
+def test_docbin(nlp, items):
+    docs = list(DocBin().from_bytes(read(write_export(items, "DocBin"))).get_docs(nlp.vocab))
+    assert [doc.text for doc in docs] == [doc.text for doc, _, _ in items]
+    assert [ent.text for ent in docs[0].ents] == ["Gallia"]
+
+
+@pytest.mark.parametrize("export_format", list(EXPORT_FORMATS))
+def test_empty_input(nlp, export_format):
+    data = read(write_export([], export_format))
+    if export_format in ("TSV", "CoNLL-U"):
+        assert data == b""
+    elif export_format == "Parquet":
+        df = pd.read_parquet(io.BytesIO(data))
+        assert list(df.columns) == COLUMNS and df.empty
+    elif export_format == "Arrow":
+        assert pa.ipc.open_stream(data).read_all().num_rows == 0
+    else:
+        assert len(DocBin().from_bytes(data)) == 0
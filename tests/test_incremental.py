@@ -0,0 +1,130 @@
+"""Tests for re-analysing edited texts."""
+
+import numpy
+import pytest
+import spacy
+from spacy.attrs import DEP, HEAD
+from spacy.language import Language
+from spacy.tokens import Span, Token
+
+from latincy_dashboard.docs import DocCache
+from latincy_dashboard.incremental import IncrementalAnalyzer
+
+if not Token.has_extension("test_upper"):
+    Token.set_extension("test_upper", default=None)
+
+
+@Language.component("test_one_sentence")
+def one_sentence(doc):
+    """Mark the whole text as one sentence, as a model may do across abbreviations."""
+    for token in doc:
+        token.is_sent_start = token.i == 0
+    return doc
+
+
+@Language.component("test_parse")
+def parse(doc):
+    """Attach every token to the first token of its sentence."""
+    heads = numpy.zeros((len(doc), 2), dtype="uint64")
+    for sent in doc.sents:
+        for token in sent:
+            # HEAD is stored as an offset from the token
+            heads[token.i, 0] = numpy.int64(sent.start - token.i).astype("uint64")
+            heads[token.i, 1] = doc.vocab.strings.add("ROOT" if token.i == sent.start else "dep")
+    doc.from_array([HEAD, DEP], heads)
+    return doc
+
+
+@Language.component("test_annotate")
+def annotate(doc):
+    for token in doc:
+        token._.test_upper = token.text.upper()
+    doc.spans["test_u"] = [Span(doc, t.i, t.i + 1, "U") for t in doc if t.text.startswith("u")]
+    return doc
+
+
+def view(doc):
+    tokens = [
+        (t.text, t.whitespace_, t.is_sent_start, t.head.i, t.dep_, t._.test_upper) for t in doc
+    ]
+    return tokens, [(s.start, s.end) for s in doc.spans.get("test_u", [])]
+
+
+def make_nlp(*pipes):
+    nlp = spacy.blank("la")
+    for pipe in pipes:
+        nlp.add_pipe(pipe)
+    nlp.add_pipe("test_annotate")
+    return nlp
+
+
+@pytest.fixture(scope="module")
+def nlp():
+    return make_nlp("sentencizer", "test_parse")
+
+
+SENTENCES = "Caesar uenit. Gallia uicta est. Urbs gaudet. Senatus uotum facit. "
+
+
+@pytest.mark.parametrize(
+    "before, after",
+    [
+        ("", SENTENCES),
+        (SENTENCES, ""),
+        ("uir", "uirum"),
+        # Inside the middle sentence
+        (SENTENCES, SENTENCES.replace("Urbs", "Roma")),
+        # Edits at a sentence boundary
+        (SENTENCES, SENTENCES.replace("est. Urbs", "est.Urbs")),
+        (SENTENCES, SENTENCES.replace("est. ", "est ")),
+        (SENTENCES, SENTENCES.replace("est. ", "est. Hostes fugiunt. ")),
+        (SENTENCES, SENTENCES.replace("est.  ", "est.\n\n")),
+        # First and last sentences
+        (SENTENCES, "Iam " + SENTENCES),
+        (SENTENCES, SENTENCES.rstrip() + " Finis"),
+    ],
+)
+@pytest.mark.parametrize("cached", [False, True])
+def test_edit_matches_single_pass(nlp, before, after, cached):
+    analyzer = IncrementalAnalyzer(DocCache(max_bytes=1 << 20) if cached else None)
+    analyzer.analyze(nlp, before)
+    doc = analyzer.analyze(nlp, after)
+    assert doc.text == after
+    assert view(doc) == view(nlp(after))
+
+
+def test_edit_reruns_neighbouring_sentences_only(nlp):
+    analyzer = IncrementalAnalyzer()
+    analyzer.analyze(nlp, SENTENCES * 3)
+    assert analyzer.last_run == {"segments": 12, "analysed": 12}
+    analyzer.analyze(nlp, (SENTENCES * 3).replace("Urbs", "Roma", 1))
+    assert analyzer.last_run == {"segments": 12, "analysed": 3}
+    analyzer.analyze(nlp, (SENTENCES * 3).replace("Urbs", "Roma", 1))
+    assert analyzer.last_run["analysed"] == 0
+
+
+def test_first_analysis_is_one_pass():
+    nlp = make_nlp("test_one_sentence")
+    text = "M. Tullius Cicero et C. Antonius consules erant."
+    doc = IncrementalAnalyzer().analyze(nlp, text)
+    assert [sent.text for sent in doc.sents] == [text]
+
+
+def test_model_sentences_are_kept_after_an_edit():
+    nlp = make_nlp("test_one_sentence")
+    analyzer = IncrementalAnalyzer()
+    analyzer.analyze(nlp, "M. Tullius Cicero et C. Antonius consules erant.")
+    doc = analyzer.analyze(nlp, "M. Tullius Cicero et C. Antonius consules fuerunt.")
+    assert len(list(doc.sents)) == 1
+
+
+def test_pipelines_without_sentences_are_cut_at_blank_lines():
+    nlp = make_nlp()
+    paragraphs = ["uir bonus", "urbs magna", "uox clara"]
+    analyzer = IncrementalAnalyzer()
+    analyzer.analyze(nlp, "\n\n".join(paragraphs))
+    assert analyzer.last_run["segments"] == 3
+    paragraphs[1] = "urbs parua"
+    doc = analyzer.analyze(nlp, "\n\n".join(paragraphs))
+    assert view(doc) == view(nlp(doc.text))
+    assert not doc.has_annotation("SENT_START")
@@ -0,0 +1,130 @@
+"""Tests for the shared model registry."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import spacy
+
+from latincy_dashboard import models
+from latincy_dashboard.models import ModelRegistry, model_pipe_names
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    """Replace spacy.load with a slow blank pipeline, recording each model loaded."""
+    calls = []
+    lock = threading.Lock()
+
+    def load(model_name, exclude=()):
+        time.sleep(0.1)
+        with lock:
+            calls.append(model_name)
+            # "flaky" fails on its first load only
+            if model_name == "broken" or (model_name == "flaky" and calls.count("flaky") == 1):
+                raise OSError(f"Can't load model {model_name!r}")
+        nlp = spacy.blank("la")
+        nlp.meta["name"] = model_name
+        return nlp
+
+    monkeypatch.setattr(models.spacy, "load", load)
+    return calls
+
+
+def resident(registry):
+    return [info["model"] for info in registry.stats() if info["resident"]]
+
+
+def test_get_shares_pipelines(loads):
+    registry = ModelRegistry()
+    nlp = registry.get("a")
+    assert registry.get("a") is nlp
+    assert registry.get("a", add=("sentencizer",)) is not nlp
+    assert registry.get("a", add=("sentencizer",)).pipe_names == ["sentencizer"]
+    assert loads == ["a", "a"]
+
+
+def test_lru_eviction(loads):
+    registry = ModelRegistry(max_models=2)
+    registry.get("a")
+    registry.get("b")
+    registry.get("a")
+    registry.get("c")
+    # b was least recently used
+    assert sorted(resident(registry)) == ["a", "c"]
+    assert registry.summary()["evictions"] == 1
+    registry.get("b")
+    assert loads == ["a", "b", "c", "b"]
+    assert sorted(resident(registry)) == ["b", "c"]
+
+
+def test_keeps_requested_pipeline_over_budget(loads):
+    registry = ModelRegistry(max_models=0)
+    nlp = registry.get("a")
+    assert resident(registry) == ["a"]
+    registry.get("b")
+    assert resident(registry) == ["b"]
+    assert nlp.meta["name"] == "a"
+
+
+def test_concurrent_get_loads_once(loads):
+    registry = ModelRegistry()
+    with ThreadPoolExecutor(8) as executor:
+        pipelines = list(executor.map(lambda _: registry.get("a"), range(16)))
+    assert loads == ["a"]
+    assert all(nlp is pipelines[0] for nlp in pipelines)
+    assert registry.stats()[0]["hits"] == 16
+
+
+def test_failed_load_is_released(loads):
+    registry = ModelRegistry()
+    with pytest.raises(OSError):
+        registry.get("broken")
+    assert registry._loading == {}
+    with pytest.raises(OSError):
+        registry.get("broken")
+    assert loads == ["broken", "broken"]
+    assert registry.summary()["loads"] == 0
+
+
+@pytest.fixture(scope="module")
+def model_dir(tmp_path_factory):
+    nlp = spacy.blank("la")
+    nlp.add_pipe("sentencizer")
+    nlp.add_pipe("lemmatizer", config={"mode": "lookup"})
+    path = tmp_path_factory.mktemp("models")
+    nlp.to_disk(path / "flat")
+    # Installed packages keep their data in a versioned subdirectory
+    (path / "package").mkdir()
+    nlp.to_disk(path / "package" / "la_test-0.0.0")
+    return path
+
+
+def test_model_pipe_names(model_dir):
+    assert model_pipe_names(str(model_dir / "flat")) == ("sentencizer", "lemmatizer")
+    assert model_pipe_names(str(model_dir / "package")) == ("sentencizer", "lemmatizer")
+
+
+def test_model_pipe_names_missing_config(tmp_path):
+    with pytest.raises(OSError, match="config.cfg"):
+        model_pipe_names(str(tmp_path))
+
+
+def test_waiters_retry_a_failed_load_once(loads):
+    registry = ModelRegistry()
+
+    def get(i):
+        # Half the sessions arrive while the retry is loading
+        time.sleep(0.15 if i % 2 else 0)
+        try:
+            return registry.get("flaky")
+        except OSError:
+            return None
+
+    with ThreadPoolExecutor(8) as executor:
+        pipelines = list(executor.map(get, range(8)))
+    # The first load fails for its caller; the waiting sessions share one retry
+    assert loads == ["flaky", "flaky"]
+    assert pipelines.count(None) == 1
+    assert len({id(nlp) for nlp in pipelines if nlp is not None}) == 1
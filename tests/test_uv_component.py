@@ -0,0 +1,48 @@
+"""Tests for the uv_normalizer pipeline component."""
+
+import pytest
+import spacy
+
+from latincy_dashboard.docs import doc_from_bytes, doc_to_bytes
+from latincy_dashboard.uv_component import UVNormalizerComponent
+
+TEXTS = [
+    "Arma uirumque cano, Troiae qui primus ab oris",
+    "Italiam fato profugus Lauiniaque uenit",
+    "uirumque uenit  uirumque.\n",
+    "",
+]
+
+
+@pytest.fixture(scope="module")
+def nlp():
+    return spacy.blank("la")
+
+
+def test_annotates_tokens(nlp, fake_normalizer):
+    doc = UVNormalizerComponent(rules=fake_normalizer)(nlp(TEXTS[2]))
+    assert [token._.uv_norm for token in doc] == ["virumque", "venit", " ", "virumque", ".", "\n"]
+    assert doc._.uv_text == "virumque venit  virumque.\n"
+    # NORM is left alone unless asked for
+    assert doc[0].norm_ == "uirumque"
+
+
+def test_pipe_matches_call(nlp, fake_normalizer):
+    piped = list(UVNormalizerComponent(rules=fake_normalizer).pipe(nlp.pipe(TEXTS), batch_size=2))
+    # Each distinct form with a u or v runs the rules once across all batches
+    forms = {token.text for doc in piped for token in doc if set(token.text) & set("uvUV")}
+    assert fake_normalizer.calls == len(forms)
+    assert [doc.text for doc in piped] == TEXTS
+    assert [doc._.uv_text for doc in piped] == [
+        fake_normalizer.normalize_detailed(text).normalized for text in TEXTS
+    ]
+    called = list(map(UVNormalizerComponent(rules=fake_normalizer), nlp.pipe(TEXTS)))
+    assert [doc._.uv_text for doc in called] == [doc._.uv_text for doc in piped]
+
+
+def test_set_norm_survives_doc_cache(nlp, fake_normalizer):
+    doc = UVNormalizerComponent(set_norm=True, rules=fake_normalizer)(nlp(TEXTS[1]))
+    restored = doc_from_bytes(nlp, doc_to_bytes(doc))
+    assert [token.norm_ for token in restored] == [token.norm_ for token in doc]
+    assert restored[-1].norm_ == "venit"
+    assert restored._.uv_text == "Italiam fato profugus Laviniaque venit"
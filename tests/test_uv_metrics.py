@@ -0,0 +1,70 @@
+"""Tests for U/V evaluation counts and metrics."""
+
+import pytest
+
+from latincy_dashboard.uv import calculate_metrics, count_metrics, metrics_from_counts, sum_counts
+
+
+def test_empty_texts():
+    assert calculate_metrics("", "", "") == {
+        "total_uv": 0,
+        "correct": 0,
+        "accuracy": 1.0,
+        "precision": 1.0,
+        "recall": 1.0,
+        "f1": 1.0,
+        "true_positives": 0,
+        "false_positives": 0,
+        "false_negatives": 0,
+        "changes_needed": 0,
+        "changes_made": 0,
+    }
+
+
+@pytest.mark.parametrize(
+    "source, normalized, reference, expected",
+    [
+        # Needed and made
+        ("u", "v", "v", {"correct": 1, "true_positives": 1, "changes_needed": 1, "changes_made": 1}),
+        # Made but not needed
+        ("u", "v", "u", {"false_positives": 1, "changes_made": 1}),
+        # Needed but not made
+        ("U", "U", "V", {"false_negatives": 1, "changes_needed": 1}),
+        # Left alone correctly
+        ("V", "V", "V", {"correct": 1}),
+        # Not a u/v position at all
+        ("a", "b", "c", {"total_uv": 0}),
+    ],
+)
+def test_single_character(source, normalized, reference, expected):
+    counts = {key: 0 for key in count_metrics("", "", "")}
+    counts["total_uv"] = 1
+    counts.update(expected)
+    assert count_metrics(source, normalized, reference) == counts
+
+
+def test_mixed_text():
+    metrics = calculate_metrics("uinum uos", "vinum uos", "vinum vos")
+    assert metrics["total_uv"] == 3
+    assert metrics["correct"] == 2
+    assert (metrics["true_positives"], metrics["false_positives"], metrics["false_negatives"]) == (1, 0, 1)
+    assert metrics["precision"] == 1.0
+    assert metrics["recall"] == 0.5
+    assert metrics["f1"] == pytest.approx(2 / 3)
+
+
+def test_only_the_common_prefix_is_scored():
+    # The normalized text is cut short; the trailing "u" is not counted
+    assert count_metrics("uau", "va", "vau")["total_uv"] == 1
+
+
+def test_astral_characters_do_not_shift_positions():
+    assert count_metrics("𝔲u", "𝔲v", "𝔲v")["true_positives"] == 1
+
+
+def test_corpus_metrics_are_micro_averaged():
+    counts = [count_metrics("uinum", "vinum", "vinum"), count_metrics("ut", "vt", "ut")]
+    total = sum_counts(counts)
+    assert total["total_uv"] == 3
+    assert total["changes_made"] == 2
+    assert metrics_from_counts(total)["precision"] == 0.5
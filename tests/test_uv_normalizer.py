@@ -0,0 +1,41 @@
+"""Tests for the per-word cache in front of the U/V normalizer."""
+
+import pytest
+
+from latincy_dashboard.uv import CachedNormalizer, UVChange, relative_changes
+
+
+TEXTS = [
+    "",
+    "uir",
+    "Arma uirumque cano, Troiae qui primus ab oris\nItaliam fato profugus",
+    # The same word at several offsets, with punctuation and hyphens around it
+    "uideo uideo (uideo) uideo.\tnouus-uir uideo  Uenus, quoque uideo",
+]
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_matches_uncached_normalizer(fake_normalizer, text):
+    expected = fake_normalizer.normalize_detailed(text)
+    result = CachedNormalizer(fake_normalizer).normalize_detailed(text)
+    assert result.original == text
+    assert result.normalized == expected.normalized
+    assert result.changes == [UVChange(*change) for change in expected.changes]
+
+
+def test_repeated_words_run_the_rules_once(fake_normalizer):
+    cached = CachedNormalizer(fake_normalizer)
+    cached.normalize_detailed(TEXTS[3])
+    # uideo, Uenus and quoque, plus the hyphenated token, which skips the cache
+    assert fake_normalizer.calls == 4
+    assert cached.stats()["misses"] == 3
+    cached.normalize_detailed(TEXTS[3])
+    assert fake_normalizer.calls == 5
+    assert cached.stats()["misses"] == 3
+
+
+def test_relative_changes_rejects_misplaced_change(fake_normalizer):
+    (change,) = fake_normalizer.normalize_detailed("uir").changes
+    assert relative_changes("uir", [change]) == ((0, "u", "v", "initial"),)
+    with pytest.raises(ValueError):
+        relative_changes("uir", [change._replace(position=1)])
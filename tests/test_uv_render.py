@@ -0,0 +1,71 @@
+"""Tests for U/V diff rendering and paging."""
+
+import pytest
+
+from latincy_dashboard.uv import (
+    HTML_END,
+    HTML_GREY,
+    MAX_RENDER_CHARS,
+    RUN_END,
+    RUN_GREEN,
+    RUN_RED,
+    colorize_changes,
+    page_bounds,
+)
+
+
+def test_empty_text():
+    assert colorize_changes("", "") == HTML_GREY + HTML_END
+
+
+def test_single_unchanged_character():
+    assert colorize_changes("a", "a") == HTML_GREY + "a" + HTML_END
+
+
+def test_changed_characters_are_grouped_in_runs():
+    assert colorize_changes("uu uia", "vv via") == (
+        f"{HTML_GREY}{RUN_GREEN}vv{RUN_END} {RUN_GREEN}v{RUN_END}ia{HTML_END}"
+    )
+
+
+def test_wrong_changes_are_red():
+    # Both characters changed; only the first matches the reference
+    assert colorize_changes("uu", "vv", "vu") == (
+        f"{HTML_GREY}{RUN_GREEN}v{RUN_END}{RUN_RED}v{RUN_END}{HTML_END}"
+    )
+
+
+def test_changes_past_the_reference_are_green():
+    assert colorize_changes("au", "av", "a") == f"{HTML_GREY}a{RUN_GREEN}v{RUN_END}{HTML_END}"
+
+
+def test_markup_is_escaped():
+    assert colorize_changes("<u&", "<v&") == f"{HTML_GREY}&lt;{RUN_GREEN}v{RUN_END}&amp;{HTML_END}"
+
+
+def test_a_page_renders_like_its_slice():
+    original, normalized, reference = "uia uox uus", "via vox vus", "via uox vvs"
+    assert colorize_changes(original, normalized, reference, 4, 8) == colorize_changes(
+        original[4:8], normalized[4:8], reference[4:8]
+    )
+
+
+@pytest.mark.parametrize("length", [0, 1, MAX_RENDER_CHARS])
+def test_short_texts_are_one_page(length):
+    text = "u" * length
+    assert page_bounds(text) == ([(0, length)] if length else [])
+
+
+def test_long_texts_break_after_whitespace():
+    text = "uirum " * (MAX_RENDER_CHARS // 3)
+    bounds = page_bounds(text)
+    assert len(bounds) == 2
+    assert bounds[0][0] == 0 and bounds[-1][1] == len(text)
+    assert all(end == next_start for (_, end), (next_start, _) in zip(bounds, bounds[1:]))
+    assert all(end - start <= MAX_RENDER_CHARS for start, end in bounds)
+    assert text[bounds[0][1] - 1] == " "
+
+
+def test_text_without_whitespace_is_cut_at_the_limit():
+    text = "u" * (MAX_RENDER_CHARS + 1)
+    assert page_bounds(text) == [(0, MAX_RENDER_CHARS), (MAX_RENDER_CHARS, MAX_RENDER_CHARS + 1)]
@@ -0,0 +1,152 @@
+"""Tests for the vectorized similarity helpers."""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from spacy.vocab import Vocab
+
+from latincy_dashboard.vectors import (
+    CandidateIndex,
+    VectorCache,
+    build_candidate_index,
+    normalize_rows,
+    quantize,
+    top_k,
+)
+
+
+class FakeVocab:
+    """A vocab whose vectors are the word lengths, counting the words looked up."""
+
+    vectors = SimpleNamespace(mode="default")
+    vectors_length = 3
+
+    def __init__(self):
+        self.lookups = []
+
+    def get_vector(self, word):
+        self.lookups.append(word)
+        return np.full(self.vectors_length, len(word), dtype=np.float32)
+
+
+@pytest.fixture(scope="module")
+def matrix():
+    return normalize_rows(np.random.default_rng(0).normal(size=(300, 32)))
+
+
+def test_normalize_rows():
+    rows = normalize_rows([[3.0, 4.0], [0.0, 0.0], [-2.0, 0.0]])
+    assert rows.dtype == np.float32
+    np.testing.assert_allclose(rows, [[0.6, 0.8], [0.0, 0.0], [-1.0, 0.0]])
+
+
+@pytest.mark.parametrize("k", [0, 1, 5, 300, 400])
+def test_top_k_matches_full_sort(matrix, k):
+    scores = matrix @ matrix[:7].T
+    expected = np.argsort(-scores.T, axis=1, kind="stable")[:, :k]
+    np.testing.assert_array_equal(top_k(scores.T, k), expected)
+    # A single row works too
+    np.testing.assert_array_equal(top_k(scores[:, 0], k), expected[0])
+
+
+def test_candidate_search_matches_brute_force(matrix):
+    words = [f"w{i}" for i in range(len(matrix))]
+    index = CandidateIndex(words, matrix * 3)
+    queries = matrix[:5] + 0.05
+    results = index.search(words[:5], queries, n_results=4)
+    for word, query, hits in zip(words[:5], queries, results):
+        query = query / np.linalg.norm(query)
+        scores = [(cand, float(np.dot(vec, query))) for cand, vec in zip(words, matrix)]
+        scores.sort(key=lambda hit: -hit[1])
+        expected = [hit for hit in scores if hit[0] != word][:4]
+        assert [cand for cand, _ in hits] == [cand for cand, _ in expected]
+        np.testing.assert_allclose([s for _, s in hits], [s for _, s in expected], rtol=1e-5)
+
+
+def test_build_candidate_index_skips_words_without_vectors():
+    vocab = Vocab()
+    vocab.set_vector("rex", np.array([1.0, 0.0], dtype=np.float32))
+    vocab.set_vector("regina", np.array([0.0, 2.0], dtype=np.float32))
+    index = build_candidate_index(vocab, ["rex", "nemo", "regina"])
+    assert index.words == ["rex", "regina"]
+    np.testing.assert_allclose(index.matrix, [[1.0, 0.0], [0.0, 1.0]])
+
+
+def test_quantize_float32(matrix):
+    data, scales = quantize(matrix, "float32")
+    assert data.dtype == np.float32 and scales is None
+    np.testing.assert_array_equal(data, matrix)
+
+
+def test_quantize_float16(matrix):
+    data, scales = quantize(matrix, "float16")
+    assert data.dtype == np.float16 and scales is None
+    np.testing.assert_allclose(data.astype(np.float32), matrix, atol=1e-3)
+
+
+def test_quantize_int8(matrix):
+    rows = np.vstack([matrix, np.zeros(matrix.shape[1], dtype=np.float32)])
+    data, scales = quantize(rows, "int8")
+    assert data.dtype == np.int8 and scales.dtype == np.float32
+    # One scale per row maps its largest magnitude to 127; an all-zero row keeps scale 1
+    np.testing.assert_allclose(scales[:-1], np.abs(matrix).max(axis=1) / 127, rtol=1e-6)
+    assert scales[-1] == 1
+    assert (np.abs(data[:-1]).max(axis=1) == 127).all()
+    # Dequantized values are off by at most half a step
+    error = np.abs(data * scales[:, None] - rows)
+    assert (error <= scales[:, None] / 2 + 1e-7).all()
+
+
+def test_quantize_unknown_dtype(matrix):
+    with pytest.raises(ValueError, match="bfloat16"):
+        quantize(matrix, "bfloat16")
+
+
+@pytest.mark.parametrize("dtype", ["float16", "int8"])
+def test_compact_top_k_agrees(matrix, dtype):
+    words = [f"w{i}" for i in range(len(matrix))]
+    queries = normalize_rows(np.random.default_rng(1).normal(size=(50, matrix.shape[1])))
+    exact = CandidateIndex(words, matrix).scores(queries)
+    compact = CandidateIndex(words, matrix, dtype=dtype).scores(queries)
+    np.testing.assert_allclose(compact, exact, atol=0.02)
+    # The top hit survives quantization for nearly every query
+    same = top_k(compact, 1)[:, 0] == top_k(exact, 1)[:, 0]
+    assert same.mean() >= 0.95
+    overlap = [len(set(a) & set(b)) for a, b in zip(top_k(compact, 10), top_k(exact, 10))]
+    assert np.mean(overlap) >= 9
+
+
+def test_vector_cache_hits_and_misses():
+    vocab = FakeVocab()
+    cache = VectorCache(max_size=10)
+    rows = cache.get(vocab, ["rex", "regina", "rex"])
+    np.testing.assert_array_equal(rows[:, 0], [3, 6, 3])
+    # Repeated words in one call are computed once
+    assert vocab.lookups == ["rex", "regina"]
+    cache.get(vocab, ["regina", "lex"])
+    assert vocab.lookups == ["rex", "regina", "lex"]
+    assert cache.stats() == {"size": 3, "max_size": 10, "hits": 2, "misses": 3, "hit_rate": 0.4}
+    assert cache.get(vocab, []).shape == (0, 3)
+
+
+def test_vector_cache_evicts_least_recently_used():
+    vocab = FakeVocab()
+    cache = VectorCache(max_size=2)
+    cache.get(vocab, ["a"])
+    cache.get(vocab, ["bb"])
+    cache.get(vocab, ["a"])
+    cache.get(vocab, ["ccc"])
+    assert len(cache) == 2
+    # "bb" was least recently used, so only it has to be computed again
+    cache.get(vocab, ["a", "bb"])
+    assert vocab.lookups == ["a", "bb", "ccc", "bb"]
+    assert len(cache) == 2
+
+
+def test_vector_cache_returns_copies():
+    vocab = FakeVocab()
+    cache = VectorCache()
+    rows = cache.get(vocab, ["rex"])
+    rows[0] = 0
+    np.testing.assert_array_equal(cache.get(vocab, ["rex"]), [[3, 3, 3]])
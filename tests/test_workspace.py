@@ -0,0 +1,91 @@
+"""Tests for the session workspace shared by the demo pages."""
+
+import pytest
+import spacy
+import streamlit as st
+from spacy.language import Language
+
+from latincy_dashboard.docs import get_doc_cache
+from latincy_dashboard.workspace import Workspace, get_workspace, workspace_text
+
+TEXT = "Gallia est omnis divisa in partes tres. Quarum unam incolunt Belgae."
+
+runs = []
+
+
+@Language.component("test_workspace_runs")
+def count_runs(doc):
+    runs.append(doc.text)
+    return doc
+
+
+def make_nlp(name):
+    nlp = spacy.blank("la")
+    nlp.add_pipe("sentencizer")
+    nlp.add_pipe("test_workspace_runs")
+    nlp.meta["name"] = name
+    return nlp
+
+
+@pytest.fixture(autouse=True)
+def fresh_session():
+    # Run outside `streamlit run`, session state and resource caches are process-wide
+    st.session_state.clear()
+    get_doc_cache.clear()
+    runs.clear()
+
+
+def test_text_is_shared_between_pages():
+    assert workspace_text("default") == "default"
+    nlp = make_nlp("parser")
+    doc = get_workspace().current_doc(nlp, True, TEXT)
+    assert doc.text == TEXT
+    assert workspace_text("default") == TEXT
+    # Another page opens on the same text, whatever its own text area holds
+    other = get_workspace().current_doc(make_nlp("ner"), False, "Arma uirumque cano.")
+    assert other.text == TEXT
+
+
+def test_nothing_to_show_until_a_text_is_submitted():
+    workspace = Workspace()
+    assert workspace.current_doc(make_nlp("ner"), False, TEXT) is None
+    assert runs == []
+
+
+def test_docs_are_kept_per_pipeline():
+    workspace = Workspace()
+    first, second = make_nlp("first"), make_nlp("second")
+    workspace.current_doc(first, True, TEXT)
+    workspace.current_doc(second, False, TEXT)
+    workspace.current_doc(first, False, TEXT)
+    workspace.current_doc(second, False, TEXT)
+    # Each pipeline ran once; revisits are DocBin loads
+    assert runs == [TEXT, TEXT]
+    assert len(workspace._docs) == 2
+    assert all(isinstance(data, bytes) for data, _ in workspace._docs.values())
+    assert workspace.last_run["analysed"] == 0
+    # A new text drops the Docs of the old one
+    workspace.current_doc(first, True, TEXT + " Aquitani tertiam.")
+    assert len(workspace._docs) == 1
+
+
+def test_max_tokens_trims_the_text():
+    workspace = Workspace()
+    nlp = make_nlp("ner")
+    doc = workspace.current_doc(nlp, True, TEXT, max_tokens=4)
+    assert doc.text == "Gallia est omnis divisa"
+    # The workspace keeps the full text for the other pages
+    assert workspace.text == TEXT
+    assert workspace.current_doc(nlp, False, TEXT).text == TEXT
+
+
+def test_one_pass_analysis():
+    workspace = Workspace()
+    nlp = make_nlp("parser")
+    doc = workspace.current_doc(nlp, True, TEXT, incremental=False)
+    assert [sent.text for sent in doc.sents] == [
+        "Gallia est omnis divisa in partes tres.",
+        "Quarum unam incolunt Belgae.",
+    ]
+    workspace.current_doc(nlp, False, TEXT, incremental=False)
+    assert runs == [TEXT]